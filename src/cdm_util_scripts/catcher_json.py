@@ -0,0 +1,151 @@
+import os
+import re
+import stat
+import json
+import uuid
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Union
+
+
+# Characters read from the edit file at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+JSON_WHITESPACE = " \t\n\r"
+VALUE_DELIMITERS = JSON_WHITESPACE + ",]"
+NON_WHITESPACE_PAT = re.compile(f"[^{JSON_WHITESPACE}]")
+
+
+def iter_edits(fp: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    # Decode the items of a top-level JSON array one at a time as fp is read,
+    # so memory use doesn't grow with the size of the edit file
+    decoder = json.JSONDecoder()
+    reader = _Buffer(fp, chunk_size)
+    if reader.next_char() != "[":
+        raise ValueError("invalid input JSON: must be a list of rows")
+    reader.pos += 1
+    if reader.next_char() == "]":
+        reader.pos += 1
+        reader.expect_end()
+        return
+    while True:
+        yield reader.decode(decoder)
+        char = reader.next_char()
+        reader.pos += 1
+        if char == "]":
+            reader.expect_end()
+            return
+        if char != ",":
+            raise json.JSONDecodeError(
+                "Expecting ',' delimiter", reader.buffer, reader.pos - 1
+            )
+
+
+def read_edits(path: Union[str, Path]) -> Iterator[Any]:
+    # Keeps the file open until the edits are exhausted or the iterator is closed
+    with open(path, mode="r", encoding="utf-8") as fp:
+        yield from iter_edits(fp)
+
+
+def write_edits(edits: Iterable[Dict[str, Any]], fp: TextIO) -> int:
+    # Write each edit as it is produced, byte for byte as json.dump(list(edits), fp, indent=2) would
+    count = 0
+    for edit in edits:
+        fp.write("[\n  " if count == 0 else ",\n  ")
+        fp.write(_encode_edit(edit))
+        count += 1
+    fp.write("\n]" if count else "[]")
+    return count
+
+
+def _encode_edit(edit: Dict[str, Any]) -> str:
+    # json.dumps only uses its C encoder without indent, so format the usual flat
+    # edit of strings directly and leave anything else to json.dumps
+    if not edit or not all(type(value) is str for value in edit.values()):
+        # JSON strings escape newlines, so every newline here is indentation
+        return json.dumps(edit, indent=2).replace("\n", "\n  ")
+    return "{\n    %s\n  }" % ",\n    ".join(
+        f"{encode_basestring_ascii(nick)}: {encode_basestring_ascii(value)}"
+        for nick, value in edit.items()
+    )
+
+
+def dump_edits(edits: Iterable[Dict[str, Any]], path: Union[str, Path]) -> int:
+    # Write next to path and move into place at the end, so edits may still be
+    # streaming from the same file and a failed run leaves path untouched
+    path = Path(path)
+    mode = _existing_mode(path)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    # Exclusive creation gives a new file the usual mode for the process umask
+    fp = open(temp_path, mode="x", encoding="utf-8")
+    try:
+        with fp:
+            count = write_edits(edits, fp)
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return count
+
+
+def _existing_mode(path: Path) -> Optional[int]:
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return None
+
+
+class _Buffer:
+    # Sliding window over fp; text before pos has been consumed
+
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self) -> str:
+        # Skip whitespace and return the next character without consuming it, "" at the end
+        while True:
+            match = NON_WHITESPACE_PAT.search(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return match.group()
+            self.pos = len(self.buffer)
+            if not self.read_more():
+                return ""
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        self.next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.read_more():
+                    continue
+                raise
+            # A number cut off by the end of a chunk (like 6. of 6.75) decodes without
+            # error, so only trust a value followed by a delimiter or the end of the file
+            if (end == len(self.buffer) or self.buffer[end] not in VALUE_DELIMITERS) and self.read_more():
+                continue
+            self.pos = end
+            return value
+
+    def expect_end(self) -> None:
+        if self.next_char():
+            raise json.JSONDecodeError("Extra data", self.buffer, self.pos)
@@ -1,11 +1,13 @@
-import requests
 import tqdm
 
-import json
+import itertools
 
 from cdm_util_scripts import cdm_api
+from cdm_util_scripts import catcher_json
+from cdm_util_scripts import sessions
+from cdm_util_scripts.concurrency import DEFAULT_WORKERS
 
-from typing import List, Dict
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
 
 
 def catchercombineterms(
@@ -14,41 +16,101 @@ def catchercombineterms(
     catcher_json_file_path: str,
     output_file_path: str,
     sort_terms: bool = True,
+    bulk: bool = False,
+    loose_matching: bool = False,
+    workers: int = DEFAULT_WORKERS,
     show_progress: bool = True,
 ) -> None:
     """Combine a cdm-catcher JSON edit of controlled vocabulary fields with terms currently in CONTENTdm"""
     progress_bar = tqdm.tqdm if show_progress else (lambda obj: obj)
-    with open(catcher_json_file_path, mode="r", encoding="utf-8") as fp:
-        catcher_edits = json.load(fp)
+    term_key = loose_term_key if loose_matching else None
 
-    combined_edits: List[Dict[str, str]] = []
-    with requests.Session() as session:
-        print("Requesting CONTENTdm item info...")
-        for edit in progress_bar(catcher_edits):
-            item_info = cdm_api.request_item_info(
+    with sessions.shared_session(workers=workers) as session:
+        if bulk:
+            print("Requesting CONTENTdm collection records...")
+            field_nicks, edited_dmrecords = collect_nicks_and_dmrecords(
+                catcher_json.read_edits(catcher_json_file_path)
+            )
+            item_infos_by_dmrecord = cdm_api.request_collection_item_infos(
                 instance_url=cdm_instance_url,
                 collection_alias=cdm_collection_alias,
-                dmrecord=edit["dmrecord"],
+                field_nicks=field_nicks,
                 session=session,
+                workers=workers,
+                dmrecords=edited_dmrecords,
             )
-            combined_edit = {"dmrecord": edit["dmrecord"]}
-            for nick, edit_value in edit.items():
-                if nick == "dmrecord":
-                    continue
-                cdm_value = item_info[nick]
-                cdm_terms = split_terms(cdm_value)
-                edit_terms = split_terms(edit_value)
-                combined_terms = cdm_terms + [
-                    term for term in edit_terms if term not in cdm_terms
-                ]
-                if sort_terms:
-                    combined_terms.sort()
-                combined_edit[nick] = "; ".join(combined_terms)
-            combined_edits.append(combined_edit)
-
-    with open(output_file_path, mode="w", encoding="utf-8") as fp:
-        json.dump(combined_edits, fp, indent=2)
+        else:
+            item_infos_by_dmrecord = {}
+        # Request item info for the remaining edits in the background, in edit order,
+        # reading their dmrecords from another pass over the edit file
+        requested_item_infos = cdm_api.iter_item_infos(
+            instance_url=cdm_instance_url,
+            collection_alias=cdm_collection_alias,
+            dmrecords=(
+                edit["dmrecord"]
+                for edit in catcher_json.read_edits(catcher_json_file_path)
+                if edit["dmrecord"] not in item_infos_by_dmrecord
+            ),
+            session=session,
+            workers=workers,
+        )
+
+        def iter_combined_edits() -> Iterator[Dict[str, str]]:
+            for edit in progress_bar(catcher_json.read_edits(catcher_json_file_path)):
+                item_info = item_infos_by_dmrecord.get(edit["dmrecord"])
+                if item_info is None:
+                    item_info = next(requested_item_infos)
+                combined_edit = {"dmrecord": edit["dmrecord"]}
+                for nick, edit_value in edit.items():
+                    if nick == "dmrecord":
+                        continue
+                    cdm_value = item_info[nick]
+                    cdm_terms = split_terms(cdm_value)
+                    edit_terms = split_terms(edit_value)
+                    combined_terms = combine_terms(cdm_terms, edit_terms, key=term_key)
+                    if sort_terms:
+                        combined_terms.sort()
+                    combined_edit[nick] = "; ".join(combined_terms)
+                yield combined_edit
+
+        # Combined edits are written as their item info arrives
+        print("Requesting CONTENTdm item info...")
+        catcher_json.dump_edits(iter_combined_edits(), output_file_path)
+
+
+def collect_nicks_and_dmrecords(
+    catcher_edits: Iterable[Dict[str, str]]
+) -> Tuple[List[str], Set[str]]:
+    # Read the edited nicks and dmrecords in one pass over the edit file
+    dmrecords: Set[str] = set()
+
+    def recording_dmrecords() -> Iterator[Dict[str, str]]:
+        for edit in catcher_edits:
+            dmrecords.add(edit["dmrecord"])
+            yield edit
+
+    return cdm_api.collect_edit_nicks(recording_dmrecords()), dmrecords
 
 
 def split_terms(value: str) -> List[str]:
     return [term.strip() for term in value.split(";") if term and not term.isspace()]
+
+
+def combine_terms(
+    cdm_terms: Iterable[str],
+    edit_terms: Iterable[str],
+    key: Optional[Callable[[str], str]] = None,
+) -> List[str]:
+    # Keep the first of any terms with the same key, checking a set instead of scanning the list
+    combined_terms: List[str] = []
+    seen_keys: Set[str] = set()
+    for term in itertools.chain(cdm_terms, edit_terms):
+        term_key = term if key is None else key(term)
+        if term_key not in seen_keys:
+            seen_keys.add(term_key)
+            combined_terms.append(term)
+    return combined_terms
+
+
+def loose_term_key(term: str) -> str:
+    return " ".join(term.split()).casefold()
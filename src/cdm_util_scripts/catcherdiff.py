@@ -1,15 +1,17 @@
 import requests
-import jinja2
 import tqdm
 
-import json
 import collections
 from datetime import datetime
 from pathlib import Path
 
 from cdm_util_scripts import cdm_api
+from cdm_util_scripts import catcher_json
+from cdm_util_scripts import reports
+from cdm_util_scripts import sessions
+from cdm_util_scripts.concurrency import DEFAULT_WORKERS
 
-from typing import Dict, List, NamedTuple, Iterable, Optional, Counter, Tuple
+from typing import Dict, List, NamedTuple, Iterable, Optional, Counter, Tuple, FrozenSet
 
 
 class Delta(NamedTuple):
@@ -17,73 +19,77 @@ class Delta(NamedTuple):
     item_info: cdm_api.CdmItemInfo
 
 
+class TermCheck(NamedTuple):
+    term: str
+    controlled: bool
+
+
 def catcherdiff(
     cdm_instance_url: str,
     cdm_collection_alias: str,
     catcher_json_file_path: str,
     report_file_path: str,
     check_vocabs: bool,
+    workers: int = DEFAULT_WORKERS,
+    bulk: bool = False,
     show_progress: bool = True,
 ) -> None:
     """Generate a HTML report on what CONTENTdm field values will change if a cdm-catcher JSON edit is implemented"""
-    with open(catcher_json_file_path, mode="r", encoding="utf-8") as fp:
-        catcher_edits = json.load(fp)
+    # The report shows every edit, so the edits are kept in memory here
+    catcher_edits: List[Dict[str, str]] = list(
+        catcher_json.read_edits(catcher_json_file_path)
+    )
 
-    with requests.Session() as session:
+    with sessions.shared_session(workers=workers) as session:
         print("Requesting CONTENTdm field info...")
-        cdm_field_infos = cdm_api.request_field_infos(
-            instance_url=cdm_instance_url,
+        cdm_field_infos = cdm_api.get_cdm_instance(
+            cdm_instance_url
+        ).request_field_infos(
             collection_alias=cdm_collection_alias,
             session=session,
         )
+        identifier_field_info = find_dc_field(cdm_field_infos, "Identifier")
+        identifier_nick = identifier_field_info.nick if identifier_field_info else None
+        title_field_info = find_dc_field(cdm_field_infos, "Title")
+        title_nick = title_field_info.nick if title_field_info else None
         print("Requesting CONTENTdm item info...")
         deltas = request_deltas(
             catcher_edits=catcher_edits,
             instance_url=cdm_instance_url,
             collection_alias=cdm_collection_alias,
             session=session,
+            workers=workers,
+            bulk=bulk,
+            extra_nicks=[nick for nick in (identifier_nick, title_nick) if nick],
             show_progress=show_progress,
         )
         if check_vocabs:
             print("Requesting CONTENTdm controlled vocabularies...")
-            cdm_vocabs = cdm_api.request_vocabs(
-                instance_url=cdm_instance_url,
+            cdm_vocabs = cdm_api.get_cdm_instance(cdm_instance_url).request_vocabs(
                 collection_alias=cdm_collection_alias,
                 field_infos=cdm_field_infos,
                 session=session,
+                workers=workers,
             )
         else:
             cdm_vocabs = None
 
     edits_with_changes_count, nicks_with_changes_counter, nicks_with_edits_counter = count_changes(deltas)
-    vocabs_by_nick: Dict[str, Optional[List[str]]] = {}
-    for field_info in cdm_field_infos:
-        vocab_info = field_info.get_vocab_info()
-        if vocab_info:
-            if cdm_vocabs:
-                vocabs_by_nick[field_info.nick] = cdm_vocabs[vocab_info]
-            else:
-                vocabs_by_nick[field_info.nick] = None
-    identifier_field_info = find_dc_field(cdm_field_infos, "Identifier")
-    identifier_nick = identifier_field_info.nick if identifier_field_info else None
-    title_field_info = find_dc_field(cdm_field_infos, "Title")
-    title_nick = title_field_info.nick if title_field_info else None
+    vocabs_by_nick = index_vocabs_by_nick(cdm_field_infos, cdm_vocabs)
+    term_checks = check_terms(deltas, vocabs_by_nick)
 
     print(
         f"catcherdiff found {edits_with_changes_count} out of {len(catcher_edits)} total edit actions would change at least one field."
     )
 
-    env = jinja2.Environment(
-        loader=jinja2.PackageLoader(__package__),
-        autoescape=True,
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    report_html = env.get_template("catcherdiff-report.html.j2").render(
+    reports.write_report(
+        "catcherdiff-report.html.j2",
+        report_file_path,
         cdm_repo_url=cdm_instance_url.rstrip("/"),
         cdm_collection_alias=cdm_collection_alias,
         cdm_field_infos=cdm_field_infos,
         vocabs_by_nick=vocabs_by_nick,
+        term_checks=term_checks,
         catcher_json_file_path=Path(catcher_json_file_path),
         report_file=report_file_path,
         report_datetime=datetime.now().isoformat(),
@@ -98,9 +104,6 @@ def catcherdiff(
         },
     )
 
-    with open(report_file_path, mode="w", encoding="utf-8") as fp:
-        fp.write(report_html)
-
 
 def request_deltas(
     catcher_edits: List[Dict[str, str]],
@@ -108,18 +111,45 @@ def request_deltas(
     collection_alias: str,
     session: requests.Session,
     show_progress: bool,
+    workers: int = DEFAULT_WORKERS,
+    bulk: bool = False,
+    extra_nicks: Iterable[str] = (),
 ) -> List[Delta]:
-    progress_bar = tqdm.tqdm if show_progress else (lambda obj: obj)
-    deltas: List[Delta] = []
-    for edit in progress_bar(catcher_edits):
-        item_info = cdm_api.request_item_info(
+    progress_bar = tqdm.tqdm if show_progress else (lambda obj, **kwargs: obj)
+    # In bulk mode read the edited fields (and extra_nicks) of the whole collection
+    # with paged dmQuery requests and only request item info for records it missed
+    if bulk:
+        item_infos_by_dmrecord = cdm_api.request_collection_item_infos(
             instance_url=instance_url,
             collection_alias=collection_alias,
-            dmrecord=edit["dmrecord"],
+            field_nicks=cdm_api.collect_edit_nicks(catcher_edits, extra_nicks=extra_nicks),
             session=session,
+            workers=workers,
+            dmrecords={edit["dmrecord"] for edit in catcher_edits},
         )
-        deltas.append(Delta(edit=strip_edit(edit), item_info=item_info))
-    return deltas
+    else:
+        item_infos_by_dmrecord = {}
+    missing_dmrecords = list(
+        dict.fromkeys(
+            edit["dmrecord"]
+            for edit in catcher_edits
+            if edit["dmrecord"] not in item_infos_by_dmrecord
+        )
+    )
+    item_infos = cdm_api.iter_item_infos(
+        instance_url=instance_url,
+        collection_alias=collection_alias,
+        dmrecords=missing_dmrecords,
+        session=session,
+        workers=workers,
+    )
+    item_infos_by_dmrecord.update(
+        zip(missing_dmrecords, progress_bar(item_infos, total=len(missing_dmrecords)))
+    )
+    return [
+        Delta(edit=strip_edit(edit), item_info=item_infos_by_dmrecord[edit["dmrecord"]])
+        for edit in catcher_edits
+    ]
 
 
 def count_changes(deltas: List[Delta]) -> Tuple[int, Counter[str], Counter[str]]:
@@ -140,6 +170,46 @@ def count_changes(deltas: List[Delta]) -> Tuple[int, Counter[str], Counter[str]]
     return edits_with_changes, nicks_with_changes, nicks_with_edits
 
 
+def index_vocabs_by_nick(
+    cdm_field_infos: Iterable[cdm_api.CdmFieldInfo],
+    cdm_vocabs: Optional[Dict[cdm_api.CdmVocabInfo, cdm_api.CdmFieldVocab]],
+) -> Dict[str, Optional[FrozenSet[str]]]:
+    # Controlled fields map to a set of their vocab's terms, or None if vocabs weren't requested.
+    # Fields sharing a vocab share one set.
+    vocab_indexes: Dict[cdm_api.CdmVocabInfo, FrozenSet[str]] = {}
+    vocabs_by_nick: Dict[str, Optional[FrozenSet[str]]] = {}
+    for field_info in cdm_field_infos:
+        vocab_info = field_info.get_vocab_info()
+        if vocab_info:
+            if cdm_vocabs:
+                if vocab_info not in vocab_indexes:
+                    vocab_indexes[vocab_info] = frozenset(cdm_vocabs[vocab_info])
+                vocabs_by_nick[field_info.nick] = vocab_indexes[vocab_info]
+            else:
+                vocabs_by_nick[field_info.nick] = None
+    return vocabs_by_nick
+
+
+def check_terms(
+    deltas: List[Delta], vocabs_by_nick: Dict[str, Optional[FrozenSet[str]]]
+) -> List[Dict[str, List[TermCheck]]]:
+    # One dict per delta of the controlled nicks' edit terms and whether each is in the vocab
+    term_checks = []
+    for delta in deltas:
+        delta_term_checks = {}
+        for nick, value in delta.edit.items():
+            vocab = vocabs_by_nick.get(nick)
+            if vocab is None:
+                continue
+            delta_term_checks[nick] = [
+                TermCheck(term=term, controlled=term in vocab)
+                for term in value.split("; ")
+                if term
+            ]
+        term_checks.append(delta_term_checks)
+    return term_checks
+
+
 def find_dc_field(
     cdm_field_infos: Iterable[cdm_api.CdmFieldInfo], dc_name: str
 ) -> Optional[cdm_api.CdmFieldInfo]:
@@ -1,7 +1,12 @@
-import json
 import re
+import functools
 
-from typing import List, Dict, Optional, Container
+from cdm_util_scripts import catcher_json
+
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Container
+
+
+TidyOperation = Callable[[str], str]
 
 
 def catchertidy(
@@ -12,65 +17,125 @@ def catchertidy(
     normalize_lcsh: Optional[Container[str]] = None,
     sort_terms: Optional[Container[str]] = None,
     lcsh_separator_spaces: bool = True,
+    verbose: bool = False,
     show_progress: bool = True,
 ) -> None:
     """Tidy up a cdm-catcher JSON edit's whitespace, quotes, and vocab term formatting"""
-    with open(catcher_json_file_path, mode="r", encoding="utf-8") as fp:
-        catcher_edits: List[Dict[str, str]] = json.load(fp)
+    lcsh_cache_before = normalize_lcsh_term.cache_info()
+    # Decide which operations apply to each nick once, not for every value
+    pipelines: Dict[str, Optional[TidyOperation]] = {}
+
+    def iter_tidy_edits(catcher_edits: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        for edit in catcher_edits:
+            tidy_edit: Dict[str, str] = {"dmrecord": edit["dmrecord"]}
+            for nick, edit_value in edit.items():
+                if nick == "dmrecord":
+                    continue
+                if nick not in pipelines:
+                    pipelines[nick] = compile_pipeline(
+                        nick,
+                        normalize_whitespace=normalize_whitespace,
+                        replace_smart_chars=replace_smart_chars,
+                        normalize_lcsh=normalize_lcsh,
+                        sort_terms=sort_terms,
+                        lcsh_separator_spaces=lcsh_separator_spaces,
+                    )
+                pipeline = pipelines[nick]
+                tidy_edit[nick] = edit_value if pipeline is None else pipeline(edit_value)
+            yield tidy_edit
+
+    # Edits are tidied and written one at a time as they are read
+    catcher_json.dump_edits(
+        iter_tidy_edits(catcher_json.read_edits(catcher_json_file_path)),
+        output_file_path,
+    )
 
-    tidy_edits: List[Dict[str, str]] = []
-    for edit in catcher_edits:
-        tidy_edit: Dict[str, str] = {"dmrecord": edit["dmrecord"]}
-        for nick, edit_value in edit.items():
-            if nick == "dmrecord":
-                continue
+    if verbose:
+        lcsh_cache_after = normalize_lcsh_term.cache_info()
+        hits = lcsh_cache_after.hits - lcsh_cache_before.hits
+        lookups = hits + lcsh_cache_after.misses - lcsh_cache_before.misses
+        if lookups:
+            print(
+                f"LCSH term cache: {hits} of {lookups} terms reused ({hits / lookups:.1%})"
+            )
 
-            if normalize_whitespace and nick in normalize_whitespace:
-                edit_value = normalize_whitespace_operation(edit_value)
 
-            if replace_smart_chars and nick in replace_smart_chars:
-                edit_value = replace_smart_chars_operation(edit_value)
+def compile_pipeline(
+    nick: str,
+    normalize_whitespace: Optional[Container[str]] = None,
+    replace_smart_chars: Optional[Container[str]] = None,
+    normalize_lcsh: Optional[Container[str]] = None,
+    sort_terms: Optional[Container[str]] = None,
+    lcsh_separator_spaces: bool = True,
+) -> Optional[TidyOperation]:
+    # Operations run in the same order as the CLI options, None if nick is left as is
+    operations: List[TidyOperation] = []
+    if normalize_whitespace and nick in normalize_whitespace:
+        operations.append(normalize_whitespace_operation)
+    if replace_smart_chars and nick in replace_smart_chars:
+        operations.append(replace_smart_chars_operation)
+    if normalize_lcsh and nick in normalize_lcsh:
+        operations.append(
+            functools.partial(
+                normalize_lcsh_operation, separator_spaces=lcsh_separator_spaces
+            )
+        )
+    if sort_terms and nick in sort_terms:
+        operations.append(sort_terms_operation)
+
+    if not operations:
+        return None
+    if len(operations) == 1:
+        return operations[0]
+
+    def pipeline(value: str) -> str:
+        for operation in operations:
+            value = operation(value)
+        return value
+
+    return pipeline
 
-            if normalize_lcsh and nick in normalize_lcsh:
-                edit_value = normalize_lcsh_operation(
-                    edit_value, separator_spaces=lcsh_separator_spaces
-                )
 
-            if sort_terms and nick in sort_terms:
-                edit_value = sort_terms_operation(edit_value)
+def normalize_whitespace_operation(value: str) -> str:
+    return " ".join(value.split())
 
-            tidy_edit[nick] = edit_value
-        tidy_edits.append(tidy_edit)
 
-    with open(output_file_path, mode="w", encoding="utf-8") as fp:
-        json.dump(tidy_edits, fp, indent=2)
+# str.replace per character beats str.translate, which is slow with the multi-character "--"
+SMART_CHAR_REPLACEMENTS = (
+    ("\u201C", '"'),
+    ("\u201D", '"'),
+    ("\u2018", "'"),
+    ("\u2019", "'"),
+    ("\u2013", "-"),
+    ("\u2014", "--"),
+)
 
 
-def normalize_whitespace_operation(value: str) -> str:
-    return " ".join(value.split())
+def replace_smart_chars_operation(value: str) -> str:
+    # Smart characters are never ASCII, and isascii() doesn't have to scan the string
+    if value.isascii():
+        return value
+    for smart_char, replacement in SMART_CHAR_REPLACEMENTS:
+        value = value.replace(smart_char, replacement)
+    return value
 
 
-def replace_smart_chars_operation(value: str) -> str:
-    return value.translate(
-        {
-            0x201C: '"',
-            0x201D: '"',
-            0x2018: "'",
-            0x2019: "'",
-            0x2013: "-",
-            0x2014: "--",
-        }
+def normalize_lcsh_operation(terms: str, separator_spaces: bool = True) -> str:
+    return "; ".join(
+        normalize_lcsh_term(term, separator_spaces=separator_spaces)
+        for term in split_controlled_vocab(terms)
     )
 
 
-def normalize_lcsh_operation(terms: str, separator_spaces: bool = True) -> str:
+# Distinct headings to remember; edits tend to repeat a few thousand headings many times
+LCSH_TERM_CACHE_SIZE = 2**16
+
+
+@functools.lru_cache(maxsize=LCSH_TERM_CACHE_SIZE)
+def normalize_lcsh_term(term: str, separator_spaces: bool = True) -> str:
     subfield_separator = " -- " if separator_spaces else "--"
-    normalized_terms: List[str] = []
-    for term in split_controlled_vocab(terms):
-        term = replace_smart_chars_operation(normalize_whitespace_operation(term))
-        parts = [part.strip() for part in term.rsplit("--")]
-        normalized_terms.append(subfield_separator.join(parts))
-    return "; ".join(normalized_terms)
+    term = replace_smart_chars_operation(" ".join(term.split()))
+    return subfield_separator.join(part.strip() for part in term.rsplit("--"))
 
 
 def sort_terms_operation(terms: str) -> str:
@@ -1,25 +1,66 @@
 import requests
 
 import csv
+import json
 import collections
 import enum
+import functools
+import itertools
+from dataclasses import dataclass, field
 
-from typing import Dict, List, Union, Tuple, NamedTuple, Optional, Any, TextIO, Iterable, Iterator
+from cdm_util_scripts.concurrency import ordered_map, DEFAULT_WORKERS
+from cdm_util_scripts.cdm_cache import DmCache, DM_FUNCTION_PAT
+from cdm_util_scripts import metrics
+
+from typing import AbstractSet, Dict, List, Union, Tuple, NamedTuple, Optional, Any, TextIO, Iterable, Iterator
 
 
 class DmError(Exception):
     pass
 
 
-def request_dm(url: str, session: requests.Session) -> Union[Dict[str, Any], List[str]]:
-    response = session.get(url)
+_dm_cache: Optional[DmCache] = None
+
+
+def set_dm_cache(cache: Optional[DmCache]) -> None:
+    global _dm_cache
+    _dm_cache = cache
+
+
+def get_dm_cache() -> Optional[DmCache]:
+    return _dm_cache
+
+
+def request_dm(
+    url: str, session: requests.Session, refresh: bool = False
+) -> Union[Dict[str, Any], List[str]]:
+    # refresh skips cached bodies but still caches the new response
+    endpoint = _dm_endpoint(url)
+    cache = _dm_cache
+    if cache is not None and not refresh:
+        cached_body = cache.get(url)
+        if cached_body is not None:
+            metrics.record_cache_hit(endpoint)
+            cached_result: Union[Dict[str, Any], List[str]] = metrics.timed_decode(
+                endpoint, json.loads, cached_body
+            )
+            return cached_result
+    response = metrics.timed_get(session, url, endpoint)
     response.raise_for_status()
-    dm_result = response.json()
+    dm_result = metrics.timed_decode(endpoint, response.json)
     if isinstance(dm_result, dict) and "code" in dm_result and "message" in dm_result:
         raise DmError(dm_result["message"])
+    # Only decode the body to text for responses the cache keeps
+    if cache is not None and cache.ttl(url) > 0:
+        cache.put(url, response.text)
     return dm_result
 
 
+def _dm_endpoint(url: str) -> str:
+    match = DM_FUNCTION_PAT.search(url)
+    return f"cdm/{match.group(1) if match else 'unknown'}"
+
+
 class CdmCollectionInfo(NamedTuple):
     alias: str
     name: str
@@ -28,13 +69,16 @@ class CdmCollectionInfo(NamedTuple):
 
 
 def request_collection_list(
-    instance_url: str, session: requests.Session
+    instance_url: str, session: requests.Session, refresh: bool = False
 ) -> List[CdmCollectionInfo]:
     instance_url = instance_url.rstrip("/")
     url = "/".join(
         [instance_url, "digital/bl/dmwebservices/index.php?q=dmGetCollectionList/json"]
     )
-    return [CdmCollectionInfo(**info) for info in request_dm(url=url, session=session)]
+    return [
+        CdmCollectionInfo(**info)
+        for info in request_dm(url=url, session=session, refresh=refresh)
+    ]
 
 
 class CdmVocabType(enum.Enum):
@@ -73,8 +117,16 @@ class CdmFieldInfo(NamedTuple):
         )
 
 
+# Dublin Core field nicks to names
+CdmDublinCoreMapping = Dict[str, str]
+
+
 def request_field_infos(
-    instance_url: str, collection_alias: str, session: requests.Session
+    instance_url: str,
+    collection_alias: str,
+    session: requests.Session,
+    dc_mapping: Optional[CdmDublinCoreMapping] = None,
+    refresh: bool = False,
 ) -> List[CdmFieldInfo]:
     infos_url = "/".join(
         [
@@ -84,27 +136,34 @@ def request_field_infos(
             "json",
         ]
     )
-    raw_infos = request_dm(url=infos_url, session=session)
-    dc_mappings_url = "/".join(
-        [
-            instance_url.rstrip("/"),
-            "digital/bl/dmwebservices/index.php?q=dmGetDublinCoreFieldInfo/json",
-        ]
-    )
-    raw_dc_mappings = request_dm(url=dc_mappings_url, session=session)
-    dc_nicks_to_names = {
-        dc_info["nick"]: dc_info["name"] for dc_info in raw_dc_mappings
-    }
+    raw_infos = request_dm(url=infos_url, session=session, refresh=refresh)
+    if dc_mapping is None:
+        dc_mapping = request_dublin_core_mapping(
+            instance_url=instance_url, session=session
+        )
     infos = []
     for info in raw_infos:
         if info["dc"] in {"BLANK", False, None, ""}:
             dc_name = None
         else:
-            dc_name = dc_nicks_to_names[info["dc"]]
+            dc_name = dc_mapping[info["dc"]]
         infos.append(CdmFieldInfo(**{**info, "dc": dc_name}))
     return infos
 
 
+def request_dublin_core_mapping(
+    instance_url: str, session: requests.Session
+) -> CdmDublinCoreMapping:
+    dc_mappings_url = "/".join(
+        [
+            instance_url.rstrip("/"),
+            "digital/bl/dmwebservices/index.php?q=dmGetDublinCoreFieldInfo/json",
+        ]
+    )
+    raw_dc_mappings = request_dm(url=dc_mappings_url, session=session)
+    return {dc_info["nick"]: dc_info["name"] for dc_info in raw_dc_mappings}
+
+
 CdmItemInfo = Dict[str, str]
 
 
@@ -124,6 +183,36 @@ def request_item_info(
     return {nick: value or "" for nick, value in item_info.items()}
 
 
+def iter_item_infos(
+    instance_url: str,
+    collection_alias: str,
+    dmrecords: Iterable[str],
+    session: requests.Session,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[CdmItemInfo]:
+    return ordered_map(
+        functools.partial(
+            _request_item_info_by_dmrecord,
+            instance_url,
+            collection_alias,
+            session,
+        ),
+        dmrecords,
+        workers=workers,
+    )
+
+
+def _request_item_info_by_dmrecord(
+    instance_url: str, collection_alias: str, session: requests.Session, dmrecord: str
+) -> CdmItemInfo:
+    return request_item_info(
+        instance_url=instance_url,
+        collection_alias=collection_alias,
+        dmrecord=dmrecord,
+        session=session,
+    )
+
+
 CdmFieldVocab = List[str]
 
 
@@ -236,37 +325,128 @@ class CdmObjectRecord:
         return self.find.endswith(".cpd")
 
 
+DMQUERY_MAXRECS = 1024
+
+
 def request_collection_object_records(
     instance_url: str,
     collection_alias: str,
     field_nicks: Iterable[str],
     session: requests.Session,
+    suppress_pages: bool = True,
+    workers: int = DEFAULT_WORKERS,
 ) -> List[CdmObjectRecord]:
-    cdm_records: List[CdmObjectRecord] = []
-    total = 1
-    start = 1
-    maxrecs = 1024
-    while len(cdm_records) < total:
-        result = request_dm(
-            url="/".join(
-                [
-                    instance_url.rstrip("/"),
-                    "digital/bl/dmwebservices/index.php?q=dmQuery",
-                    collection_alias,
-                    "CISOSEARCHALL",
-                    "!".join(field_nicks),
-                    "pointer",
-                    str(maxrecs),
-                    str(start),
-                    "1/0/0/0/0/1/json",
-                ]
-            ),
+    return list(
+        iter_collection_object_records(
+            instance_url=instance_url,
+            collection_alias=collection_alias,
+            field_nicks=field_nicks,
             session=session,
+            suppress_pages=suppress_pages,
+            workers=workers,
         )
-        total = int(result["pager"]["total"])
-        start += maxrecs
-        cdm_records.extend(CdmObjectRecord(**record) for record in result["records"])
-    return cdm_records
+    )
+
+
+def iter_collection_object_records(
+    instance_url: str,
+    collection_alias: str,
+    field_nicks: Iterable[str],
+    session: requests.Session,
+    suppress_pages: bool = True,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[CdmObjectRecord]:
+    request_page = functools.partial(
+        _request_collection_records_page,
+        instance_url,
+        collection_alias,
+        list(field_nicks),
+        suppress_pages,
+        session,
+    )
+    first_page = request_page(1)
+    total = int(first_page["pager"]["total"])
+    # The first page gives the total, so the remaining pages can be requested
+    # concurrently while earlier ones are consumed, still in pointer order
+    pages = itertools.chain(
+        [first_page],
+        ordered_map(
+            request_page,
+            range(1 + DMQUERY_MAXRECS, total + 1, DMQUERY_MAXRECS),
+            workers=workers,
+        ),
+    )
+    for page in pages:
+        for record in page["records"]:
+            yield CdmObjectRecord(**record)
+
+
+def _request_collection_records_page(
+    instance_url: str,
+    collection_alias: str,
+    field_nicks: List[str],
+    suppress_pages: bool,
+    session: requests.Session,
+    start: int,
+) -> Dict[str, Any]:
+    result = request_dm(
+        url="/".join(
+            [
+                instance_url.rstrip("/"),
+                "digital/bl/dmwebservices/index.php?q=dmQuery",
+                collection_alias,
+                "CISOSEARCHALL",
+                "!".join(field_nicks),
+                "pointer",
+                str(DMQUERY_MAXRECS),
+                str(start),
+                str(int(suppress_pages)),
+                "0/0/0/0/1/json",
+            ]
+        ),
+        session=session,
+    )
+    if not isinstance(result, dict):
+        raise DmError("unexpected dmQuery response")
+    return result
+
+
+def request_collection_item_infos(
+    instance_url: str,
+    collection_alias: str,
+    field_nicks: Iterable[str],
+    session: requests.Session,
+    workers: int = DEFAULT_WORKERS,
+    dmrecords: Optional[AbstractSet[str]] = None,
+) -> Dict[str, CdmItemInfo]:
+    # Only index dmrecords, if given, so memory follows the edit rather than the collection
+    records = iter_collection_object_records(
+        instance_url=instance_url,
+        collection_alias=collection_alias,
+        field_nicks=[nick for nick in field_nicks if nick != "dmrecord"],
+        session=session,
+        suppress_pages=False,
+        workers=workers,
+    )
+    item_infos: Dict[str, CdmItemInfo] = {}
+    for record in records:
+        dmrecord = str(record.pointer)
+        if dmrecords is not None and dmrecord not in dmrecords:
+            continue
+        item_info = {nick: value or "" for nick, value in record.fields.items()}
+        item_info["dmrecord"] = dmrecord
+        item_infos[dmrecord] = item_info
+    return item_infos
+
+
+def collect_edit_nicks(
+    catcher_edits: Iterable[Dict[str, str]], extra_nicks: Iterable[str] = ()
+) -> List[str]:
+    nicks = dict.fromkeys(extra_nicks)
+    for edit in catcher_edits:
+        nicks.update(dict.fromkeys(edit))
+    nicks.pop("dmrecord", None)
+    return list(nicks)
 
 
 CdmFieldMapping = Dict[str, List[str]]
@@ -323,19 +503,138 @@ def request_vocabs(
     collection_alias: str,
     field_infos: List[CdmFieldInfo],
     session: requests.Session,
-) -> Dict[CdmVocabInfo, List[str]]:
-    vocabs = dict()
+    workers: int = DEFAULT_WORKERS,
+    builtin_vocabs: Optional[Dict[CdmVocabInfo, CdmFieldVocab]] = None,
+) -> Dict[CdmVocabInfo, CdmFieldVocab]:
+    # Fields sharing a vocab only need one request, and builtin vocabs already in
+    # builtin_vocabs need none
+    field_infos_by_vocab_info: Dict[CdmVocabInfo, CdmFieldInfo] = {}
     for field_info in field_infos:
         vocab_info = field_info.get_vocab_info()
-        if vocab_info is None or vocab_info in vocabs:
+        if vocab_info is not None and vocab_info not in field_infos_by_vocab_info:
+            field_infos_by_vocab_info[vocab_info] = field_info
+    vocab_infos_to_request = []
+    for vocab_info, field_info in field_infos_by_vocab_info.items():
+        if builtin_vocabs is not None and vocab_info in builtin_vocabs:
             continue
         print(
             f"Requesting {field_info.name if vocab_info.vocab_type is CdmVocabType.custom else vocab_info.key!r} vocab..."
         )
-        vocabs[vocab_info] = request_field_vocab(
-            instance_url=instance_url,
+        vocab_infos_to_request.append(vocab_info)
+
+    request_vocab = functools.partial(
+        request_field_vocab,
+        instance_url,
+        collection_alias,
+        session=session,
+    )
+    requested_vocabs = dict(
+        zip(
+            vocab_infos_to_request,
+            ordered_map(
+                request_vocab,
+                [field_infos_by_vocab_info[vocab_info].nick for vocab_info in vocab_infos_to_request],
+                workers=workers,
+            ),
+        )
+    )
+    if builtin_vocabs is None:
+        builtin_vocabs = {}
+    builtin_vocabs.update(
+        (vocab_info, vocab)
+        for vocab_info, vocab in requested_vocabs.items()
+        if vocab_info.vocab_type is CdmVocabType.builtin
+    )
+    return {
+        vocab_info: requested_vocabs[vocab_info] if vocab_info in requested_vocabs else builtin_vocabs[vocab_info]
+        for vocab_info in field_infos_by_vocab_info
+    }
+
+
+@dataclass
+class CdmInstance:
+    # Collection list, Dublin Core mapping, field infos, and builtin vocabs are requested
+    # once per instance and reused until invalidated
+    url: str
+    _collection_list: Optional[List[CdmCollectionInfo]] = field(
+        default=None, init=False, repr=False
+    )
+    _dc_mapping: Optional[CdmDublinCoreMapping] = field(
+        default=None, init=False, repr=False
+    )
+    _field_infos: Dict[str, List[CdmFieldInfo]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _builtin_vocabs: Dict[CdmVocabInfo, CdmFieldVocab] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self.url = self.url.rstrip("/")
+
+    def request_collection_list(
+        self, session: requests.Session, refresh: bool = False
+    ) -> List[CdmCollectionInfo]:
+        # refresh requests the list again, bypassing the DmCache too
+        if self._collection_list is None or refresh:
+            self._collection_list = request_collection_list(
+                instance_url=self.url, session=session, refresh=refresh
+            )
+        return list(self._collection_list)
+
+    def request_dublin_core_mapping(
+        self, session: requests.Session
+    ) -> CdmDublinCoreMapping:
+        if self._dc_mapping is None:
+            self._dc_mapping = request_dublin_core_mapping(
+                instance_url=self.url, session=session
+            )
+        return dict(self._dc_mapping)
+
+    def request_field_infos(
+        self, collection_alias: str, session: requests.Session, refresh: bool = False
+    ) -> List[CdmFieldInfo]:
+        if collection_alias not in self._field_infos or refresh:
+            self._field_infos[collection_alias] = request_field_infos(
+                instance_url=self.url,
+                collection_alias=collection_alias,
+                session=session,
+                dc_mapping=self.request_dublin_core_mapping(session=session),
+                refresh=refresh,
+            )
+        return list(self._field_infos[collection_alias])
+
+    def request_vocabs(
+        self,
+        collection_alias: str,
+        field_infos: List[CdmFieldInfo],
+        session: requests.Session,
+        workers: int = DEFAULT_WORKERS,
+    ) -> Dict[CdmVocabInfo, CdmFieldVocab]:
+        return request_vocabs(
+            instance_url=self.url,
             collection_alias=collection_alias,
-            field_nick=field_info.nick,
+            field_infos=field_infos,
             session=session,
+            workers=workers,
+            builtin_vocabs=self._builtin_vocabs,
         )
-    return vocabs
+
+    def invalidate(self, collection_alias: Optional[str] = None) -> None:
+        if collection_alias is not None:
+            self._field_infos.pop(collection_alias, None)
+            return
+        self._collection_list = None
+        self._dc_mapping = None
+        self._field_infos.clear()
+        self._builtin_vocabs.clear()
+
+
+_cdm_instances: Dict[str, CdmInstance] = {}
+
+
+def get_cdm_instance(instance_url: str) -> CdmInstance:
+    instance_url = instance_url.rstrip("/")
+    if instance_url not in _cdm_instances:
+        _cdm_instances[instance_url] = CdmInstance(url=instance_url)
+    return _cdm_instances[instance_url]
@@ -0,0 +1,168 @@
+import os
+import re
+import sys
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+from typing import Callable, Dict, NamedTuple, Optional, Union
+
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Seconds to keep dmwebservices responses by function; functions not listed aren't cached.
+# Item-level calls are left out so catcherdiff and friends always see live values.
+DEFAULT_TTLS: Dict[str, float] = {
+    "dmGetCollectionList": DAY,
+    "dmGetCollectionFieldInfo": DAY,
+    "dmGetDublinCoreFieldInfo": 7 * DAY,
+    "dmGetCollectionFieldVocabulary": HOUR,
+}
+DEFAULT_MAX_BYTES = 256 * 2**20
+CACHE_FILENAME = "dmwebservices.sqlite3"
+
+DM_FUNCTION_PAT = re.compile(r"[?&]q=(\w+)")
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    total_bytes: int
+
+
+class DmCache:
+    """SQLite-backed cache of dmwebservices response bodies keyed by URL
+
+    Entries expire according to per-function TTLs and the least recently used
+    entries are evicted once the cached bodies exceed max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                function TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+
+    @classmethod
+    def from_dir(cls, cache_dir: Union[str, Path], **kwargs) -> "DmCache":
+        return cls(Path(cache_dir) / CACHE_FILENAME, **kwargs)
+
+    def ttl(self, url: str) -> float:
+        match = DM_FUNCTION_PAT.search(url)
+        if match is None:
+            return 0
+        return self.ttls.get(match.group(1), 0)
+
+    def get(self, url: str) -> Optional[str]:
+        ttl = self.ttl(url)
+        if ttl <= 0:
+            return None
+        now = self.clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, stored FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None or now - row[1] > ttl:
+                if row is not None:
+                    self._connection.execute(
+                        "DELETE FROM responses WHERE url = ?", (url,)
+                    )
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE url = ?", (now, url)
+            )
+            self.hits += 1
+            body: str = row[0]
+            return body
+
+    def put(self, url: str, body: str) -> None:
+        match = DM_FUNCTION_PAT.search(url)
+        if match is None or self.ttl(url) <= 0:
+            return
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = self.clock()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, match.group(1), body, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (total_bytes,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total_bytes <= self.max_bytes:
+            return
+        evicted = []
+        for url, size in self._connection.execute(
+            "SELECT url, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total_bytes <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total_bytes -= size
+        self._connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, total_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=entries,
+            total_bytes=total_bytes,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def default_cache_dir() -> Path:
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "cdm-util-scripts"
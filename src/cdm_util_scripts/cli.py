@@ -1,9 +1,9 @@
 import argparse
-import requests
 
 import json
 import csv
 import sys
+import sqlite3
 import itertools
 
 from typing import Optional, Sequence, Dict, List
@@ -19,6 +19,10 @@ from cdm_util_scripts import ftptransc2catcher
 from cdm_util_scripts import ftpstruct2catcher
 from cdm_util_scripts import scanftpschema
 from cdm_util_scripts import gui
+from cdm_util_scripts import sessions
+from cdm_util_scripts import metrics
+from cdm_util_scripts.concurrency import DEFAULT_WORKERS
+from cdm_util_scripts.cdm_cache import DmCache, default_cache_dir
 
 
 def catchertidy_compound_options():
@@ -31,8 +35,61 @@ def catchertidy_compound_options():
     return combos
 
 
+# Options taken by main itself rather than passed on to the subcommand
+GLOBAL_OPTIONS = frozenset(
+    [
+        "func",
+        "uses_dm_cache",
+        "cache_dir",
+        "no_cache",
+        "metrics_json",
+        "hedge_percentile",
+        "hedge_budget",
+        "adaptive_concurrency",
+    ]
+)
+
+
 def main(test_args: Optional[Sequence[str]] = None) -> int:
-    parser = argparse.ArgumentParser(description="cdm-util-scripts")
+    parser = argparse.ArgumentParser(
+        description="cdm-util-scripts",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        action="store",
+        default=str(default_cache_dir()),
+        help="Directory for the CONTENTdm response cache",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the CONTENTdm response cache",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        action="store",
+        metavar="PATH",
+        help="Also write the request metrics summary to this JSON file",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        action="store",
+        type=float,
+        help="Resend GET requests still unanswered after this percentile of observed latency, using whichever response arrives first",
+    )
+    parser.add_argument(
+        "--hedge-budget",
+        action="store",
+        type=float,
+        default=0.05,
+        help="Resent requests allowed per request sent when hedging",
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adjust how many requests each server gets at once, backing off when it is overloaded; --workers becomes the upper bound",
+    )
     subparsers = parser.add_subparsers()
 
     # catcherdiff
@@ -60,7 +117,20 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         const=True,
         help="Check controlled vocabulary terms",
     )
-    catcherdiff_subparser.set_defaults(func=catcherdiff.catcherdiff)
+    catcherdiff_subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of concurrent CONTENTdm item info requests",
+    )
+    catcherdiff_subparser.add_argument(
+        "-b",
+        "--bulk",
+        action="store_true",
+        help="Read the edited fields of the whole collection with paged dmQuery requests instead of requesting each edited record",
+    )
+    catcherdiff_subparser.set_defaults(func=catcherdiff.catcherdiff, uses_dm_cache=True)
 
     # catchercombineterms
     catchercombineterms_subparser = subparsers.add_parser(
@@ -87,11 +157,31 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         action="store_false",
         help="Do not sort combined terms",
     )
+    catchercombineterms_subparser.add_argument(
+        "-b",
+        "--bulk",
+        action="store_true",
+        help="Read the edited fields of the whole collection with paged dmQuery requests instead of requesting each edited record",
+    )
+
+    catchercombineterms_subparser.add_argument(
+        "-l",
+        "--loose-matching",
+        action="store_true",
+        help="Treat terms that differ only in case or whitespace as the same term",
+    )
+    catchercombineterms_subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of concurrent CONTENTdm item info requests",
+    )
 
     def catchercombineterms_func(*args, unsorted, **kwargs):
         catchercombineterms.catchercombineterms(*args, sort_terms=unsorted, **kwargs)
 
-    catchercombineterms_subparser.set_defaults(func=catchercombineterms_func)
+    catchercombineterms_subparser.set_defaults(func=catchercombineterms_func, uses_dm_cache=True)
 
     # catchertidy
     catchertidy_subparser = subparsers.add_parser(
@@ -125,6 +215,10 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         "-e", "--no-sep-space", action="store_true",
         help="Don't use spaces around subfield delimiters when normalizing LCSH"
     )
+    catchertidy_subparser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="Report how often normalized LCSH terms were reused"
+    )
     catchertidy_subparser.add_argument(
         "catcher_json_file_path",
         help="Path to cdm-catcher JSON file",
@@ -141,6 +235,7 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
             normalize_lcsh,
             sort_terms,
             no_sep_space,
+            verbose,
             catcher_json_file_path,
             output_file_path,
             **kwargs
@@ -168,6 +263,7 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
             normalize_lcsh=normalize_lcsh,
             sort_terms=sort_terms,
             lcsh_separator_spaces=not no_sep_space,
+            verbose=verbose,
         )
 
     catchertidy_subparser.set_defaults(func=catchertidy_func)
@@ -236,6 +332,17 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         default="Verbatim Plaintext",
         help="FromThePage transcript type",
     )
+    ftptransc2catcher_subparser.add_argument(
+        "-b",
+        "--bulk",
+        action="store_true",
+        help="Request each work's XHTML Export once and split it into page transcripts instead of requesting each page's transcript",
+    )
+    ftptransc2catcher_subparser.add_argument(
+        "--omit-skipped",
+        action="store_true",
+        help="Leave blank and untranscribed pages out of the output instead of writing empty edits for them",
+    )
     ftptransc2catcher_subparser.set_defaults(func=ftptransc2catcher.ftptransc2catcher)
 
     # ftpstruct2catcher
@@ -263,6 +370,13 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         default=ftpstruct2catcher.Level.AUTO.value,
         help="Description level to use",
     )
+    ftpstruct2catcher_subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of concurrent FromThePage requests",
+    )
     ftpstruct2catcher_subparser.set_defaults(func=ftpstruct2catcher.ftpstruct2catcher)
 
     # scanftpschema
@@ -276,6 +390,13 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         "ftp_project_name", help="FromThePage project name"
     )
     scanftpschema_subparser.add_argument("report_path", help="Report file path")
+    scanftpschema_subparser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of concurrent FromThePage requests",
+    )
     scanftpschema_subparser.set_defaults(func=scanftpschema.scanftpschema)
 
     # GUI
@@ -284,7 +405,7 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         help="Launch a GUI version of this utility",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    gui_subparser.set_defaults(func=gui.gui)
+    gui_subparser.set_defaults(func=gui.gui, uses_dm_cache=True)
 
     # ftpinfo
     ftpinfo_subparser = subparsers.add_parser(
@@ -327,16 +448,102 @@ def main(test_args: Optional[Sequence[str]] = None) -> int:
         action="store",
         help="Specify columns to print in a comma separated string, as --columns name,nick",
     )
-    cdminfo_subparser.set_defaults(func=cdminfo)
+    cdminfo_subparser.set_defaults(func=cdminfo, uses_dm_cache=True)
 
     args = parser.parse_args(test_args)
-    args.func(**{key: value for key, value in vars(args).items() if key != "func"})
+    # Only subcommands that request CONTENTdm dmwebservices open the cache
+    cache = None
+    if getattr(args, "uses_dm_cache", False) and not args.no_cache:
+        cache = open_dm_cache(args.cache_dir)
+    cdm_api.set_dm_cache(cache)
+    request_metrics = metrics.RequestMetrics()
+    metrics.set_metrics(request_metrics)
+    hedge_policy = None
+    if args.hedge_percentile is not None:
+        hedge_policy = sessions.HedgePolicy(
+            percentile=args.hedge_percentile, budget=args.hedge_budget
+        )
+        sessions.get_shared_session().hedge_policy = hedge_policy
+    if args.adaptive_concurrency:
+        # The subcommand's --workers caps each server's limit
+        workers = getattr(args, "workers", DEFAULT_WORKERS)
+        sessions.get_shared_session().enable_adaptive_limits(
+            initial_limit=min(DEFAULT_WORKERS, workers), max_limit=workers
+        )
+    try:
+        args.func(
+            **{
+                key: value
+                for key, value in vars(args).items()
+                if key not in GLOBAL_OPTIONS
+            }
+        )
+    finally:
+        cdm_api.set_dm_cache(None)
+        if cache is not None:
+            print_cache_stats(cache)
+            cache.close()
+        if hedge_policy is not None:
+            sessions.get_shared_session().hedge_policy = None
+            print_hedge_stats(hedge_policy)
+        if args.adaptive_concurrency:
+            print_limiter_stats(sessions.get_shared_session().limiters)
+            sessions.get_shared_session().disable_adaptive_limits()
+        metrics.set_metrics(None)
+        print_request_metrics(request_metrics, args.metrics_json)
 
     return 0
 
 
+def print_request_metrics(
+    request_metrics: metrics.RequestMetrics, metrics_json_path: Optional[str]
+) -> None:
+    summary = request_metrics.format_summary()
+    if summary:
+        print(summary, file=sys.stderr)
+    if metrics_json_path is not None:
+        request_metrics.write_json(metrics_json_path)
+
+
+def open_dm_cache(cache_dir: str) -> Optional[DmCache]:
+    try:
+        return DmCache.from_dir(cache_dir)
+    except (OSError, sqlite3.Error) as err:
+        print(
+            f"Warning: running without the CONTENTdm response cache, couldn't open it in {cache_dir}: {err}",
+            file=sys.stderr,
+        )
+        return None
+
+
+def print_cache_stats(cache: DmCache) -> None:
+    stats = cache.stats()
+    if stats.hits or stats.misses:
+        print(
+            f"CONTENTdm response cache: {stats.hits} hits, {stats.misses} misses",
+            file=sys.stderr,
+        )
+
+
+def print_hedge_stats(hedge_policy: sessions.HedgePolicy) -> None:
+    if hedge_policy.hedges_sent:
+        print(
+            f"Hedged requests: {hedge_policy.hedges_sent} sent, {hedge_policy.hedges_won} answered first",
+            file=sys.stderr,
+        )
+
+
+def print_limiter_stats(limiters: Dict[str, sessions.AdaptiveLimiter]) -> None:
+    for host, limiter in limiters.items():
+        stats = limiter.stats()
+        print(
+            f"{host}: concurrency limit {stats.limit:.1f}, {stats.completed} requests, {stats.throttled} throttled, {stats.throughput:.1f} requests/s",
+            file=sys.stderr,
+        )
+
+
 def ftpinfo(slug: str, output_format: str) -> None:
-    with requests.Session() as session:
+    with sessions.shared_session() as session:
         ftp_instance = ftp_api.FtpInstance(url=ftp_api.FTP_HOSTED_URL)
         ftp_projects = ftp_instance.request_projects(slug=slug, session=session)
 
@@ -358,22 +565,20 @@ def cdminfo(
     columns: Optional[str],
     output_format: str,
 ) -> None:
-    with requests.Session() as session:
+    with sessions.shared_session() as session:
         if alias is not None:
             dm_result = [
                 field_info._asdict()
-                for field_info in cdm_api.request_field_infos(
-                    instance_url=instance_url,
-                    collection_alias=alias,
-                    session=session,
-                )
+                for field_info in cdm_api.get_cdm_instance(
+                    instance_url
+                ).request_field_infos(collection_alias=alias, session=session)
             ]
         else:
             dm_result = [
                 collection_info._asdict()
-                for collection_info in cdm_api.request_collection_list(
-                    instance_url=instance_url, session=session
-                )
+                for collection_info in cdm_api.get_cdm_instance(
+                    instance_url
+                ).request_collection_list(session=session)
             ]
 
     if columns is not None:
@@ -0,0 +1,33 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from typing import Callable, Iterable, Iterator, TypeVar, Deque
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+DEFAULT_WORKERS = 4
+
+
+def ordered_map(
+    func: Callable[[T], R], items: Iterable[T], workers: int = DEFAULT_WORKERS
+) -> Iterator[R]:
+    """Lazily map func over items using a bounded thread pool, yielding results in input order"""
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    # Bound the number of submitted calls so results don't pile up ahead of the consumer
+    pending: Deque["Future[R]"] = collections.deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
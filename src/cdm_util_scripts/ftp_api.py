@@ -6,7 +6,10 @@ from urllib.parse import urlsplit
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
 
-from typing import List, Dict, Any, Tuple, Optional, NamedTuple, Union
+from cdm_util_scripts.concurrency import ordered_map, DEFAULT_WORKERS
+from cdm_util_scripts import metrics
+
+from typing import List, Dict, Any, Tuple, Optional, NamedTuple, Union, Iterable, Iterator, Callable
 
 
 FTP_HOSTED_URL = "https://fromthepage.com"
@@ -15,6 +18,18 @@ FTP_HOSTED_URL = "https://fromthepage.com"
 FtpFieldBasedTranscription = List[Optional[Dict[str, str]]]
 
 
+def _get(session: requests.Session, url: str, endpoint: str, **kwargs: Any) -> requests.Response:
+    # Every FromThePage request goes through here so it shows up in the request metrics
+    response = metrics.timed_get(session, url, f"ftp/{endpoint}", **kwargs)
+    response.raise_for_status()
+    return response
+
+
+def _get_json(session: requests.Session, url: str, endpoint: str) -> Any:
+    response = _get(session, url, endpoint)
+    return metrics.timed_decode(f"ftp/{endpoint}", response.json)
+
+
 @dataclass
 class FtpInstance:
     url: str
@@ -25,9 +40,9 @@ class FtpInstance:
     def request_projects(
         self, slug: str, session: requests.Session
     ) -> "FtpProjectCollection":
-        response = session.get(f"{self.url}/iiif/collections/{slug}")
-        response.raise_for_status()
-        projects = FtpProjectCollection.from_json(response.json())
+        projects = FtpProjectCollection.from_json(
+            _get_json(session, f"{self.url}/iiif/collections/{slug}", "collection")
+        )
         return projects
 
 
@@ -78,10 +93,7 @@ class FtpProject:
         return project
 
     def request(self, session: requests.Session) -> None:
-        response = session.get(self.url)
-        response.raise_for_status()
-        json = response.json()
-        self._load(json)
+        self._load(_get_json(session, self.url, "project"))
 
     def _load(self, json: Dict[str, Any]) -> None:
         self.url = json["@id"]
@@ -90,11 +102,18 @@ class FtpProject:
         self.works = [FtpWork.from_json(manifest) for manifest in json["manifests"]]
 
     def request_works(
-        self, session: requests.Session, show_progress: bool = True
+        self,
+        session: requests.Session,
+        show_progress: bool = True,
+        workers: int = DEFAULT_WORKERS,
     ) -> None:
-        works = tqdm.tqdm(self.works) if show_progress else self.works
-        for work in works:
-            work.request(session=session)
+        # Works load their manifests in place, so self.works keeps its order
+        progress_bar = tqdm.tqdm if show_progress else (lambda obj, **kwargs: obj)
+        requests_done = ordered_map(
+            lambda work: work.request(session=session), self.works, workers=workers
+        )
+        for _ in progress_bar(requests_done, total=len(self.works)):
+            pass
 
     def request_work_structured_data_config(
         self, session: requests.Session
@@ -120,11 +139,13 @@ class FtpProject:
 def _request_structured_data_configuration(
     instance_url: str, project_id: str, level: str, session: requests.Session
 ) -> "FtpStructuredDataConfig":
-    response = session.get(
-        f"{instance_url}/iiif/{project_id}/structured/config/{level}"
+    return FtpStructuredDataConfig.from_json(
+        _get_json(
+            session,
+            f"{instance_url}/iiif/{project_id}/structured/config/{level}",
+            "structured-config",
+        )
     )
-    response.raise_for_status()
-    return FtpStructuredDataConfig.from_json(response.json())
 
 
 @dataclass
@@ -203,10 +224,7 @@ class FtpWork:
         return work
 
     def request(self, session: requests.Session) -> None:
-        response = session.get(self.url)
-        response.raise_for_status()
-        json = response.json()
-        self._load(json)
+        self._load(_get_json(session, self.url, "manifest"))
 
     def _load(self, json: Dict[str, Any]) -> None:
         # Update everything based on the new data
@@ -302,9 +320,8 @@ class FtpWork:
         raise KeyError(repr(value))
 
     def request_rendering(self, label: str, session: requests.Session) -> str:
-        response = session.get(self._get_rendering(attr="label", value=label).url)
-        response.raise_for_status()
-        return response.text
+        url = self._get_rendering(attr="label", value=label).url
+        return _get(session, url, f"rendering/{label}").text
 
     def request_transcript_fields(
         self,
@@ -312,14 +329,41 @@ class FtpWork:
         label: str = "XHTML Export",
         empty_page_is_none: bool = True,
     ) -> FtpFieldBasedTranscription:
-        raw_rendering = self.request_rendering(label=label, session=session)
-        field_based_transcription = RENDERING_EXTRACTORS[label](raw_rendering)
-        if empty_page_is_none:
-            return [
-                fields if fields and any(fields.values()) else None
-                for fields in field_based_transcription
-            ]
-        return field_based_transcription
+        return list(
+            self.iter_transcript_fields(
+                session=session, label=label, empty_page_is_none=empty_page_is_none
+            )
+        )
+
+    def iter_transcript_fields(
+        self,
+        session: requests.Session,
+        label: str = "XHTML Export",
+        empty_page_is_none: bool = True,
+    ) -> Iterator[Optional[Dict[str, str]]]:
+        # Parse the export as it downloads so only one page is held in memory at a time
+        url = self._get_rendering(attr="label", value=label).url
+        endpoint = f"rendering/{label}"
+        with _get(session, url, endpoint, stream=True) as response:
+            chunks = metrics.count_bytes(
+                f"ftp/{endpoint}", response.iter_content(chunk_size=RENDERING_CHUNK_SIZE)
+            )
+            for fields in RENDERING_FIELD_ITERATORS[label](chunks):
+                if empty_page_is_none and not (fields and any(fields.values())):
+                    yield None
+                else:
+                    yield fields
+
+    def iter_page_transcripts(self, session: requests.Session) -> Iterator[str]:
+        # One request for the whole work instead of one per page
+        url = self._get_rendering(attr="label", value="XHTML Export").url
+        with _get(session, url, "rendering/XHTML Export", stream=True) as response:
+            yield from iter_page_texts_from_xhtml(
+                metrics.count_bytes(
+                    "ftp/rendering/XHTML Export",
+                    response.iter_content(chunk_size=RENDERING_CHUNK_SIZE),
+                )
+            )
 
     def request_structured_data(self, session: requests.Session) -> "FtpStructuredData":
         for rendering in self.renderings:
@@ -330,9 +374,9 @@ class FtpWork:
                 break
         else:
             raise KeyError("couldn't find work structured data rendering")
-        response = session.get(url)
-        response.raise_for_status()
-        return FtpStructuredData.from_json(response.json())
+        return FtpStructuredData.from_json(
+            _get_json(session, url, "work-structured-data")
+        )
 
 
 class FtpRendering(NamedTuple):
@@ -386,9 +430,8 @@ class FtpPage:
         )
 
     def request_transcript(self, label: str, session: requests.Session) -> str:
-        response = session.get(self._get_rendering(attr="label", value=label).url)
-        response.raise_for_status()
-        return response.text
+        url = self._get_rendering(attr="label", value=label).url
+        return _get(session, url, f"page-transcript/{label}").text
 
     def _get_rendering(self, attr: str, value: str) -> FtpRendering:
         for rendering in self.renderings:
@@ -404,9 +447,9 @@ class FtpPage:
                 break
         else:
             raise KeyError("couldn't find page structured data rendering")
-        response = session.get(rendering.url)
-        response.raise_for_status()
-        return FtpStructuredData.from_json(response.json())
+        return FtpStructuredData.from_json(
+            _get_json(session, rendering.url, "page-structured-data")
+        )
 
     @property
     def needs_review(self) -> Optional[bool]:
@@ -478,6 +521,18 @@ def parse_ftp_canvas_id(id_: str) -> Tuple[Optional[str], Optional[str], Optiona
     return (None, None, None)
 
 
+def iter_structured_data(
+    described: Iterable[Union[FtpWork, FtpPage]],
+    session: requests.Session,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[FtpStructuredData]:
+    return ordered_map(
+        lambda work_or_page: work_or_page.request_structured_data(session=session),
+        described,
+        workers=workers,
+    )
+
+
 def request_ftp_project(
     instance_url: str, slug: str, project_label: str, session: requests.Session
 ) -> FtpProject:
@@ -492,6 +547,7 @@ def request_ftp_project_and_works(
     project_label: str,
     session: requests.Session,
     show_progress: bool = True,
+    workers: int = DEFAULT_WORKERS,
 ) -> FtpProject:
     project = request_ftp_project(
         instance_url=instance_url,
@@ -499,38 +555,117 @@ def request_ftp_project_and_works(
         project_label=project_label,
         session=session,
     )
-    project.request_works(session=session, show_progress=show_progress)
+    project.request_works(session=session, show_progress=show_progress, workers=workers)
     return project
 
 
+XHTML_SCRIPT_PAT = re.compile(rb"<script>?.*</script>")
+
+
 def extract_fields_from_tei(tei: str) -> FtpFieldBasedTranscription:
+    return list(iter_fields_from_tei([tei.encode("utf-8")]))
+
+
+def extract_fields_from_xhtml(xhtml: str) -> FtpFieldBasedTranscription:
+    return list(iter_fields_from_xhtml([xhtml.encode("utf-8")]))
+
+
+def iter_fields_from_tei(chunks: Iterable[bytes]) -> Iterator[Optional[Dict[str, str]]]:
     NS = {"ns": "http://www.tei-c.org/ns/1.0"}
-    tei_root = ET.fromstring(tei)
-    tei_pages = tei_root.findall("./ns:text/ns:body/ns:div", namespaces=NS)
-    pages = []
-    for tei_page in tei_pages:
+    # Pages are ./ns:text/ns:body/ns:div
+    page_path = [f"{{{NS['ns']}}}{tag}" for tag in ["TEI", "text", "body", "div"]]
+    for tei_page in _iter_page_elements(_lstrip_chunks(chunks), page_path):
         tei_fields = tei_page.findall("ns:p", namespaces=NS)
-        fields = extract_fields_from_p_span_xml(tei_fields, namespaces=NS)
-        pages.append(fields)
-    return pages
+        yield extract_fields_from_p_span_xml(tei_fields, namespaces=NS)
 
 
-def extract_fields_from_xhtml(xhtml: str) -> FtpFieldBasedTranscription:
+def iter_fields_from_xhtml(chunks: Iterable[bytes]) -> Iterator[Optional[Dict[str, str]]]:
     NS = {"ns": "http://www.w3.org/1999/xhtml"}
-    # The FromThePage XHTML Export isn't valid XHTML because of the JS blob on line 6
-    html_no_scripts = re.sub(r"<script>?.*</script>", "", xhtml).strip()
-    html_root = ET.fromstring(html_no_scripts)
-    html_pages = html_root.findall(
-        "ns:body/ns:div[@class='pages']/ns:div", namespaces=NS
-    )
-    pages = []
-    for html_page in html_pages:
+    for html_page in _iter_xhtml_page_elements(chunks):
         html_fields = html_page.findall(
             "ns:div[@class='page-content']/ns:p", namespaces=NS
         )
-        fields = extract_fields_from_p_span_xml(html_fields, namespaces=NS)
-        pages.append(fields)
-    return pages
+        yield extract_fields_from_p_span_xml(html_fields, namespaces=NS)
+
+
+def iter_page_texts_from_xhtml(chunks: Iterable[bytes]) -> Iterator[str]:
+    # Approximates each page's Verbatim Plaintext rendering: paragraphs separated by blank lines
+    # and no trailing whitespace on lines
+    NS = {"ns": "http://www.w3.org/1999/xhtml"}
+    for html_page in _iter_xhtml_page_elements(chunks):
+        html_ps = html_page.findall(
+            "ns:div[@class='page-content']/ns:p", namespaces=NS
+        )
+        yield "\n\n".join(
+            "\n".join(line.rstrip() for line in "".join(html_p.itertext()).strip().splitlines())
+            for html_p in html_ps
+        )
+
+
+def _iter_xhtml_page_elements(chunks: Iterable[bytes]) -> Iterator[ET.Element]:
+    NS = {"ns": "http://www.w3.org/1999/xhtml"}
+    # The FromThePage XHTML Export isn't valid XHTML because of the JS blob on line 6
+    lines = (XHTML_SCRIPT_PAT.sub(b"", line) for line in _iter_lines(chunks))
+    # Pages are ns:body/ns:div[@class='pages']/ns:div
+    page_path = [f"{{{NS['ns']}}}{tag}" for tag in ["html", "body", "div", "div"]]
+    return _iter_page_elements(
+        _lstrip_chunks(lines),
+        page_path,
+        lambda ancestors: ancestors[2].get("class") == "pages",
+    )
+
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    pending = b""
+    for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + b"\n"
+    if pending:
+        yield pending
+
+
+def _lstrip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # An XML declaration has to be the very first thing in the document
+    chunks = iter(chunks)
+    for chunk in chunks:
+        chunk = chunk.lstrip()
+        if chunk:
+            yield chunk
+            break
+    yield from chunks
+
+
+def _iter_page_elements(
+    chunks: Iterable[bytes],
+    page_path: List[str],
+    ancestors_match: Callable[[List[ET.Element]], bool] = lambda ancestors: True,
+) -> Iterator[ET.Element]:
+    # Yield each complete element at page_path (root tag first), then drop it from the tree
+    parser: "ET.XMLPullParser[ET.Element]" = ET.XMLPullParser(events=("start", "end"))
+    ancestors: List[ET.Element] = []
+
+    def events() -> Iterator[Any]:
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    for event, element in events():
+        if event == "start":
+            ancestors.append(element)
+            continue
+        ancestors.pop()
+        if (
+            len(ancestors) == len(page_path) - 1
+            and [ancestor.tag for ancestor in ancestors] + [element.tag] == page_path
+            and ancestors_match(ancestors)
+        ):
+            yield element
+            element.clear()
+            ancestors[-1].remove(element)
 
 
 def extract_fields_from_p_span_xml(
@@ -555,6 +690,11 @@ RENDERING_EXTRACTORS = {
     "XHTML Export": extract_fields_from_xhtml,
     "TEI Export": extract_fields_from_tei,
 }
+RENDERING_FIELD_ITERATORS = {
+    "XHTML Export": iter_fields_from_xhtml,
+    "TEI Export": iter_fields_from_tei,
+}
+RENDERING_CHUNK_SIZE = 64 * 1024
 
 
 def removesuffix(s: str, suffix: str) -> str:
@@ -1,13 +1,14 @@
-import requests
 import tqdm
 
 import json
 import enum
 
-from typing import List, Dict, Iterator, Tuple
+from typing import List, Dict, Iterator, Tuple, Union, NamedTuple, Optional
 
 from cdm_util_scripts import ftp_api
 from cdm_util_scripts import cdm_api
+from cdm_util_scripts import sessions
+from cdm_util_scripts.concurrency import DEFAULT_WORKERS
 
 
 class Level(str, enum.Enum):
@@ -17,19 +18,26 @@ class Level(str, enum.Enum):
     AUTO = "auto"
 
 
+class EditTarget(NamedTuple):
+    described: Union[ftp_api.FtpWork, ftp_api.FtpPage]
+    dmrecord: Optional[str]
+    ids_to_nicks: Dict[str, List[str]]
+
+
 def ftpstruct2catcher(
     ftp_slug: str,
     ftp_project_name: str,
     field_mapping_csv_path: str,
     level: Level,
     output_file_path: str,
+    workers: int = DEFAULT_WORKERS,
     show_progress: bool = True,
 ) -> None:
     """Request FromThePage Metadata Fields and/or Transcription Fields data as cdm-catcher JSON edits"""
-    progress_bar = tqdm.tqdm if show_progress else (lambda obj: obj)
+    progress_bar = tqdm.tqdm if show_progress else (lambda obj, **kwargs: obj)
     field_mapping = cdm_api.read_csv_field_mapping(field_mapping_csv_path)
 
-    with requests.Session() as session:
+    with sessions.shared_session(workers=workers) as session:
         print("Requesting project information...")
         ftp_project = ftp_api.request_ftp_project_and_works(
             instance_url=ftp_api.FTP_HOSTED_URL,
@@ -37,6 +45,7 @@ def ftpstruct2catcher(
             project_label=ftp_project_name,
             session=session,
             show_progress=show_progress,
+            workers=workers,
         )
 
         works_count = len(ftp_project.works)
@@ -105,28 +114,34 @@ def ftpstruct2catcher(
             raise ValueError("unable to map any FromThePage fields to CONTENTdm nicks")
 
         print("Requesting structured data...")
-        edits = []
-        for ftp_work in progress_bar(ftp_project.works):
-            # Keep page-level edits before object-level edits to avoid locking CONTENTdm objects
+        # Keep page-level edits before object-level edits to avoid locking CONTENTdm objects
+        edit_targets: List[EditTarget] = []
+        for ftp_work in ftp_project.works:
             if page_config_ids_to_cdm_nicks:
                 for ftp_page in ftp_work.pages:
-                    if not ftp_page.has_transcript:
-                        continue
-                    edit = structured_data_to_catcher_edit(
-                        dmrecord=ftp_page.cdm_page_dmrecord,
-                        data=ftp_page.request_structured_data(session=session),
-                        ids_to_nicks=page_config_ids_to_cdm_nicks,
-                    )
-                    edits.append(edit)
-            if work_config_ids_to_cdm_nicks:
-                if not ftp_work.metadata_status == "described":
-                    continue
-                edit = structured_data_to_catcher_edit(
-                    dmrecord=ftp_work.cdm_object_dmrecord,
-                    data=ftp_work.request_structured_data(session=session),
-                    ids_to_nicks=work_config_ids_to_cdm_nicks,
+                    if ftp_page.has_transcript:
+                        edit_targets.append(
+                            EditTarget(ftp_page, ftp_page.cdm_page_dmrecord, page_config_ids_to_cdm_nicks)
+                        )
+            if work_config_ids_to_cdm_nicks and ftp_work.metadata_status == "described":
+                edit_targets.append(
+                    EditTarget(ftp_work, ftp_work.cdm_object_dmrecord, work_config_ids_to_cdm_nicks)
                 )
-                edits.append(edit)
+        structured_data = ftp_api.iter_structured_data(
+            [edit_target.described for edit_target in edit_targets],
+            session=session,
+            workers=workers,
+        )
+        edits = [
+            structured_data_to_catcher_edit(
+                dmrecord=edit_target.dmrecord,
+                data=data,
+                ids_to_nicks=edit_target.ids_to_nicks,
+            )
+            for edit_target, data in zip(
+                edit_targets, progress_bar(structured_data, total=len(edit_targets))
+            )
+        ]
 
     print(f"Writing {len(edits)} catcher edits...")
     with open(output_file_path, mode="w", encoding="utf-8") as fp:
@@ -164,9 +179,9 @@ def count_statuses(ftp_project: ftp_api.FtpProject) -> Tuple[int, int]:
 
 
 def structured_data_to_catcher_edit(
-    dmrecord: str, data: ftp_api.FtpStructuredData, ids_to_nicks: Dict[str, List[str]]
-) -> Dict[str, str]:
-    edit = {"dmrecord": dmrecord}
+    dmrecord: Optional[str], data: ftp_api.FtpStructuredData, ids_to_nicks: Dict[str, List[str]]
+) -> Dict[str, Optional[str]]:
+    edit: Dict[str, Optional[str]] = {"dmrecord": dmrecord}
     for field_data in data.data:
         config_id = field_data.config
         if config_id not in ids_to_nicks:
@@ -4,6 +4,13 @@ import tqdm
 import json
 
 from cdm_util_scripts import ftp_api
+from cdm_util_scripts import sessions
+
+from typing import List, Iterable
+
+
+# Page texts split from the XHTML Export approximate this page-level rendering
+BULK_TRANSCRIPT_TYPE = "Verbatim Plaintext"
 
 
 def ftptransc2catcher(
@@ -11,25 +18,49 @@ def ftptransc2catcher(
     transcript_nick: str,
     output_file_path: str,
     transcript_type: str,
+    bulk: bool = False,
+    omit_skipped: bool = False,
     show_progress: bool = True,
 ) -> None:
     """Request transcripts from FromThePage works corresponding to manifest URLs listed in a text file as cdm-catcher JSON edits"""
+    if bulk and transcript_type != BULK_TRANSCRIPT_TYPE:
+        raise ValueError(f"bulk mode only supports {BULK_TRANSCRIPT_TYPE!r} transcripts")
     progress_bar = tqdm.tqdm if show_progress else (lambda obj: obj)
 
     with open(manifests_listing_path, mode="r", encoding="utf-8") as fp:
         manifest_urls = [line.strip() for line in fp.readlines()]
 
-    with requests.Session() as session:
+    with sessions.shared_session() as session:
         catcher_edits = []
+        skipped_requests_count = 0
 
         print("Requesting transcripts...")
         for manifest_url in progress_bar(manifest_urls):
             ftp_work = ftp_api.FtpWork.from_url(manifest_url, session=session)
-            for ftp_page in ftp_work.pages:
-                transcript = ftp_page.request_transcript(
-                    label=transcript_type,
-                    session=session,
+            # Blank and untranscribed pages get an empty transcript without a request
+            pages_needing_transcripts = [
+                ftp_page for ftp_page in ftp_work.pages if needs_transcript(ftp_page)
+            ]
+            transcripts: Iterable[str]
+            if bulk:
+                if pages_needing_transcripts:
+                    transcripts = request_work_page_transcripts(ftp_work, session=session)
+                else:
+                    transcripts = [""] * len(ftp_work.pages)
+                    skipped_requests_count += 1
+            else:
+                transcripts = (
+                    ftp_page.request_transcript(label=transcript_type, session=session)
+                    if needs_transcript(ftp_page)
+                    else ""
+                    for ftp_page in ftp_work.pages
                 )
+                skipped_requests_count += len(ftp_work.pages) - len(pages_needing_transcripts)
+            for ftp_page, transcript in zip(ftp_work.pages, transcripts):
+                if not needs_transcript(ftp_page):
+                    if omit_skipped:
+                        continue
+                    transcript = ""
                 catcher_edits.append(
                     {
                         "dmrecord": ftp_page.cdm_page_dmrecord,
@@ -37,6 +68,23 @@ def ftptransc2catcher(
                     }
                 )
 
+    print(f"Skipped {skipped_requests_count} transcript requests for blank or untranscribed pages")
     print("Writing JSON file...")
     with open(output_file_path, mode="w", encoding="utf-8") as fp:
         json.dump(catcher_edits, fp, indent=2)
+
+
+def needs_transcript(ftp_page: ftp_api.FtpPage) -> bool:
+    return bool(ftp_page.has_transcript) and not ftp_page.marked_blank
+
+
+def request_work_page_transcripts(
+    ftp_work: ftp_api.FtpWork, session: requests.Session
+) -> List[str]:
+    # Split the work's XHTML Export into page transcripts, matched to the manifest's pages by order
+    transcripts = list(ftp_work.iter_page_transcripts(session=session))
+    if len(transcripts) != len(ftp_work.pages):
+        raise ValueError(
+            f"{ftp_work.url} XHTML Export has {len(transcripts)} pages but the manifest has {len(ftp_work.pages)}"
+        )
+    return transcripts
@@ -8,10 +8,9 @@ from tkinter import filedialog
 from tkinter import messagebox
 from tkinter import scrolledtext
 
-import requests
-
 from cdm_util_scripts import cdm_api
 from cdm_util_scripts import ftp_api
+from cdm_util_scripts import sessions
 from cdm_util_scripts.catcherdiff import catcherdiff
 from cdm_util_scripts.catchercombineterms import catchercombineterms
 from cdm_util_scripts.catchertidy import catchertidy
@@ -263,6 +262,7 @@ class CatcherCombineTerms:
     catcher_json_file_path: tk.StringVar
     output_file_path: tk.StringVar
     sort_terms: tk.BooleanVar
+    loose_matching: tk.BooleanVar
 
     def __init__(self, notebook: ttk.Notebook) -> None:
         frame = ttk.Frame(notebook)
@@ -349,11 +349,20 @@ class CatcherCombineTerms:
             offvalue=False,
         ).grid(column=0, row=5, sticky="w", padx=PADX, pady=PADY)
 
+        self.loose_matching = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            frame,
+            text="Ignore Case and Whitespace When Matching Terms",
+            variable=self.loose_matching,
+            onvalue=True,
+            offvalue=False,
+        ).grid(column=0, row=6, sticky="w", padx=PADX, pady=PADY)
+
         ttk.Button(
             frame,
             text="Run",
             command=self.run,
-        ).grid(column=0, row=6, sticky="w", padx=PADX, pady=PADY)
+        ).grid(column=0, row=7, sticky="w", padx=PADX, pady=PADY)
 
     def request_aliases(self) -> None:
         cdm_instance_url = self.cdm_instance_url.get()
@@ -402,6 +411,7 @@ class CatcherCombineTerms:
             messagebox.showerror(message="Please enter a Combined Catcher JSON file path")
             return
         sort_terms = self.sort_terms.get()
+        loose_matching = self.loose_matching.get()
         print(
             textwrap.dedent(f"""\
         catchercombineterms(
@@ -410,6 +420,7 @@ class CatcherCombineTerms:
             catcher_json_file_path={catcher_json_file_path},
             output_file_path={output_file_path},
             sort_terms={sort_terms},
+            loose_matching={loose_matching},
         )"""))
         catchercombineterms(
             cdm_instance_url=cdm_instance_url,
@@ -417,6 +428,7 @@ class CatcherCombineTerms:
             catcher_json_file_path=catcher_json_file_path,
             output_file_path=output_file_path,
             sort_terms=sort_terms,
+            loose_matching=loose_matching,
             show_progress=False,
         )
 
@@ -1459,11 +1471,11 @@ class Json2Csv:
 
 def request_contentdm_collection_aliases(cdm_instance_url: str) -> Dict[str, str]:
     print("Requesting CONTENTdm collection aliases...")
-    with requests.Session() as session:
-        cdm_collection_list = cdm_api.request_collection_list(
-            instance_url=cdm_instance_url,
-            session=session,
-        )
+    # GUI requests always ask the server again, and later commands reuse the refreshed values
+    with sessions.shared_session() as session:
+        cdm_collection_list = cdm_api.get_cdm_instance(
+            cdm_instance_url
+        ).request_collection_list(session=session, refresh=True)
     print("Done")
     return {
         info.name: info.alias.lstrip("/") for info in cdm_collection_list
@@ -1478,11 +1490,11 @@ class ShortFieldInfo(NamedTuple):
 
 def request_contentdm_field_info(cdm_instance_url: str, cdm_collection_alias: str) -> List[cdm_api.CdmFieldInfo]:
     print("Requesting CONTENTdm field info...")
-    with requests.Session() as session:
-        field_infos = cdm_api.request_field_infos(
-            instance_url=cdm_instance_url,
+    with sessions.shared_session() as session:
+        field_infos = cdm_api.get_cdm_instance(cdm_instance_url).request_field_infos(
             collection_alias=cdm_collection_alias,
             session=session,
+            refresh=True,
         )
         print("Done")
         return field_infos
@@ -1490,7 +1502,7 @@ def request_contentdm_field_info(cdm_instance_url: str, cdm_collection_alias: st
 
 def request_fromthepage_project_names(ftp_slug: str) -> List[str]:
     print("Requesting FromThePage project names...")
-    with requests.Session() as session:
+    with sessions.shared_session() as session:
         ftp_instance = ftp_api.FtpInstance(
             url=ftp_api.FTP_HOSTED_URL,
         )
@@ -1525,11 +1537,11 @@ def cdmschema2csv(
     show_progress: bool = False,
 ) -> None:
     """Jump start a CONTENTdm field mapping by writing a CONTENTdm collection's editable names and nicks to CSV"""
-    with requests.Session() as session:
-        field_infos = cdm_api.request_field_infos(
-            instance_url=cdm_instance_url,
+    with sessions.shared_session() as session:
+        field_infos = cdm_api.get_cdm_instance(cdm_instance_url).request_field_infos(
             collection_alias=cdm_collection_alias,
             session=session,
+            refresh=True,
         )
     with open(csv_file_path, mode="w", encoding="utf-8", newline="") as fp:
         writer = csv.DictWriter(fp, fieldnames=["name", "nick"], dialect="excel")
@@ -1,7 +1,8 @@
 import csv
-import json
 
-from typing import List, Union
+from cdm_util_scripts import catcher_json
+
+from typing import Dict, Union
 
 
 def json2csv(
@@ -11,18 +12,14 @@ def json2csv(
     show_progress: bool = False
 ) -> None:
     """Transpose a list of JSON objects (cdm-catcher JSON edits) into a CSV file"""
-    with open(input_json_path, mode="r", encoding="utf-8") as fp:
-        input_json = json.load(fp)
-    if not isinstance(input_json, list):
-        raise ValueError("invalid input JSON: must be a list of rows")
-    fieldnames: List[str] = []
-    for edit in input_json:
+    # Read the edits twice, once to collect the columns and once to write the rows,
+    # rather than holding the whole file in memory
+    fieldnames: Dict[str, None] = {}
+    for edit in catcher_json.read_edits(input_json_path):
         if not isinstance(edit, dict):
             raise ValueError("invalid input JSON: rows must be JSON objects")
-        for column_name in edit:
-            if column_name not in fieldnames:
-                fieldnames.append(column_name)
+        fieldnames.update(dict.fromkeys(edit))
     with open(output_csv_path, mode="w", encoding="utf-8", newline="") as fp:
-        writer = csv.DictWriter(fp, dialect=csv_dialect, fieldnames=fieldnames)
+        writer = csv.DictWriter(fp, dialect=csv_dialect, fieldnames=list(fieldnames))
         writer.writeheader()
-        writer.writerows(input_json)
+        writer.writerows(catcher_json.read_edits(input_json_path))
@@ -0,0 +1,178 @@
+import requests
+
+import json
+import time
+import bisect
+import threading
+import contextlib
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+
+T = TypeVar("T")
+
+
+# Upper bounds in seconds of the latency histogram buckets; one more bucket catches anything slower
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _empty_histogram() -> List[int]:
+    return [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    bytes: int = 0
+    decode_seconds: float = 0.0
+    histogram: List[int] = field(default_factory=_empty_histogram)
+
+
+class RequestMetrics:
+    """Per-endpoint request counts, latency histograms, bytes, and decode times
+
+    Endpoints are short names like "cdm/dmGetItemInfo" or "ftp/manifest".
+    Stages time other work, like rendering reports, so it can be compared
+    with time spent on the network.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> EndpointStats:
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointStats()
+        return self.endpoints[endpoint]
+
+    def record_request(
+        self, endpoint: str, seconds: float, nbytes: int = 0, error: bool = False
+    ) -> None:
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.requests += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.bytes += nbytes
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def record_bytes(self, endpoint: str, nbytes: int) -> None:
+        # For streamed bodies, which are counted as they are read
+        with self._lock:
+            self._endpoint(endpoint).bytes += nbytes
+
+    def record_decode(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._endpoint(endpoint).decode_seconds += seconds
+
+    def record_cache_hit(self, endpoint: str) -> None:
+        with self._lock:
+            self._endpoint(endpoint).cache_hits += 1
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "latency_buckets": list(LATENCY_BUCKETS),
+                "endpoints": {
+                    endpoint: asdict(stats)
+                    for endpoint, stats in sorted(self.endpoints.items())
+                },
+                "stages": dict(sorted(self.stages.items())),
+            }
+
+    def format_summary(self) -> str:
+        summary = self.as_dict()
+        lines = []
+        for endpoint, stats in summary["endpoints"].items():
+            requests = stats["requests"]
+            mean = stats["seconds"] / requests if requests else 0.0
+            lines.append(
+                f"{endpoint}: {requests} requests ({stats['errors']} failed, {stats['cache_hits']} cached),"
+                f" {mean:.3f}s mean, {stats['max_seconds']:.3f}s max, {stats['bytes']} bytes,"
+                f" {stats['decode_seconds']:.3f}s decoding"
+            )
+        for stage, seconds in summary["stages"].items():
+            lines.append(f"{stage}: {seconds:.3f}s")
+        return "\n".join(lines)
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        with open(path, mode="w", encoding="utf-8") as fp:
+            json.dump(self.as_dict(), fp, indent=2)
+
+
+# Metrics recorded by cdm_api, ftp_api, and reports, or None to record nothing
+_metrics: Optional[RequestMetrics] = None
+
+
+def set_metrics(metrics: Optional[RequestMetrics]) -> None:
+    global _metrics
+    _metrics = metrics
+
+
+def get_metrics() -> Optional[RequestMetrics]:
+    return _metrics
+
+
+@contextlib.contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _metrics is not None:
+            _metrics.record_stage(stage, time.perf_counter() - start)
+
+
+def timed_get(
+    session: requests.Session, url: str, endpoint: str, **kwargs: Any
+) -> requests.Response:
+    # Streamed bodies aren't read here, so only their time to headers is recorded
+    if _metrics is None:
+        return session.get(url, **kwargs)
+    metrics = _metrics
+    start = time.perf_counter()
+    try:
+        response = session.get(url, **kwargs)
+    except requests.RequestException:
+        metrics.record_request(endpoint, time.perf_counter() - start, error=True)
+        raise
+    nbytes = 0 if kwargs.get("stream") else len(response.content)
+    metrics.record_request(
+        endpoint, time.perf_counter() - start, nbytes=nbytes, error=not response.ok
+    )
+    return response
+
+
+def timed_decode(endpoint: str, decode: Callable[..., T], *args: Any) -> T:
+    if _metrics is None:
+        return decode(*args)
+    metrics = _metrics
+    start = time.perf_counter()
+    try:
+        return decode(*args)
+    finally:
+        metrics.record_decode(endpoint, time.perf_counter() - start)
+
+
+def count_bytes(endpoint: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    for chunk in chunks:
+        if _metrics is not None:
+            _metrics.record_bytes(endpoint, len(chunk))
+        yield chunk
+
+
+def record_cache_hit(endpoint: str) -> None:
+    if _metrics is not None:
+        _metrics.record_cache_hit(endpoint)
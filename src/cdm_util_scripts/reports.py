@@ -0,0 +1,28 @@
+import jinja2
+
+from pathlib import Path
+
+from cdm_util_scripts import metrics
+
+from typing import Any, Union
+
+
+# Number of rendered template chunks joined into each write
+STREAM_BUFFER_SIZE = 64
+
+
+def write_report(
+    template_name: str, report_path: Union[str, Path], **context: Any
+) -> None:
+    # Stream the rendered template into the file so the whole report is never held in memory
+    env = jinja2.Environment(
+        loader=jinja2.PackageLoader(__package__),
+        autoescape=True,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    stream = env.get_template(template_name).stream(**context)
+    stream.enable_buffering(size=STREAM_BUFFER_SIZE)
+    with metrics.timed_stage(f"report/{template_name}"):
+        with open(report_path, mode="w", encoding="utf-8") as fp:
+            fp.writelines(stream)
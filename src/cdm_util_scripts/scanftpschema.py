@@ -1,5 +1,3 @@
-import jinja2
-import requests
 import tqdm
 
 import datetime
@@ -8,6 +6,9 @@ import typing
 from typing import List, FrozenSet, Dict, Union, Counter, NamedTuple
 
 from cdm_util_scripts import ftp_api
+from cdm_util_scripts import reports
+from cdm_util_scripts import sessions
+from cdm_util_scripts.concurrency import DEFAULT_WORKERS
 
 
 class WorkAndFields(NamedTuple):
@@ -24,11 +25,12 @@ def scanftpschema(
     ftp_slug: str,
     ftp_project_name: str,
     report_path: str,
+    workers: int = DEFAULT_WORKERS,
     show_progress: bool = True,
 ) -> None:
     """Generate a HTML report on the Metadata Fields/Transcription Fields schema(s) in a FromThePage project"""
-    progress_bar = tqdm.tqdm if show_progress else (lambda obj: obj)
-    with requests.Session() as session:
+    progress_bar = tqdm.tqdm if show_progress else (lambda obj, **kwargs: obj)
+    with sessions.shared_session(workers=workers) as session:
         print("Requesting FromThePage project data...")
         ftp_project = ftp_api.request_ftp_project(
             instance_url=ftp_api.FTP_HOSTED_URL,
@@ -48,21 +50,29 @@ def scanftpschema(
             return None
 
         print("Requesting FromThePage project work data...")
-        ftp_project.request_works(session=session, show_progress=show_progress)
+        ftp_project.request_works(
+            session=session, show_progress=show_progress, workers=workers
+        )
 
         print("Requesting FromThePage project structured descriptions...")
-        project_works_and_fields: List[WorkAndFields] = []
-        project_pages_and_fields: List[PageAndFields] = []
-        for work in progress_bar(ftp_project.works):
+        described: List[Union[ftp_api.FtpWork, ftp_api.FtpPage]] = []
+        for work in ftp_project.works:
             if has_work_description:
-                project_works_and_fields.append(
-                    WorkAndFields(work, work.request_structured_data(session=session))
-                )
+                described.append(work)
             if has_page_description:
-                for page in work.pages:
-                    project_pages_and_fields.append(
-                        PageAndFields(page, page.request_structured_data(session=session))
-                    )
+                described.extend(work.pages)
+        structured_data = ftp_api.iter_structured_data(
+            described, session=session, workers=workers
+        )
+        project_works_and_fields: List[WorkAndFields] = []
+        project_pages_and_fields: List[PageAndFields] = []
+        for ftp_object, fields in zip(
+            described, progress_bar(structured_data, total=len(described))
+        ):
+            if isinstance(ftp_object, ftp_api.FtpPage):
+                project_pages_and_fields.append(PageAndFields(ftp_object, fields))
+            else:
+                project_works_and_fields.append(WorkAndFields(ftp_object, fields))
 
     print("Collating field sets...")
     works_by_field_set = collate_field_sets(project_works_and_fields)
@@ -71,13 +81,9 @@ def scanftpschema(
     page_field_counts_by_config_id = count_field_occurrences(pages_by_field_set)
 
     print("Compiling report...")
-    env = jinja2.Environment(
-        loader=jinja2.PackageLoader(__package__),
-        autoescape=True,
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    report_html = env.get_template("scanftpschema-report.html.j2").render(
+    reports.write_report(
+        "scanftpschema-report.html.j2",
+        report_path,
         slug=ftp_slug,
         project_label=ftp_project_name,
         project_manifest_url=ftp_project.url,
@@ -96,9 +102,6 @@ def scanftpschema(
         },
     )
 
-    with open(report_path, mode="w", encoding="utf-8") as fp:
-        fp.write(report_html)
-
 
 @typing.overload
 def collate_field_sets(
@@ -0,0 +1,419 @@
+import requests
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+
+import time
+import functools
+import threading
+import contextlib
+import collections
+import email.utils
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+from cdm_util_scripts.concurrency import DEFAULT_WORKERS
+
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# (connect, read) timeouts in seconds, applied to requests that don't set their own
+DEFAULT_TIMEOUT: Tuple[float, float] = (10, 120)
+
+
+class HedgePolicy:
+    """When to send a duplicate of a slow GET request
+
+    A GET that hasn't answered after the given percentile of recently observed
+    latencies is sent again, and whichever response arrives first is used.
+    Every request earns budget hedges (0.05 allows about one hedge per twenty
+    requests), so the extra load stays bounded.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 500,
+        max_burst: float = 10,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies: Deque[float] = collections.deque(maxlen=window)
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> Optional[float]:
+        # Seconds to wait before hedging, or None while no hedge can be sent:
+        # until enough latencies are known or while the budget is spent
+        with self._lock:
+            self._tokens = min(self._tokens + self.budget, self.max_burst)
+            if len(self._latencies) < self.min_samples or self._tokens < 1:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self.percentile / 100), len(latencies) - 1)
+        return latencies[index]
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges_sent += 1
+            return True
+
+
+# Responses that mean the server wants fewer requests
+THROTTLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+# Throttled GET responses worth sending again once the server is ready
+RETRY_STATUSES = frozenset([429, 503])
+
+
+class LimiterStats(NamedTuple):
+    limit: float
+    in_flight: int
+    completed: int
+    throttled: int
+    throughput: float
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrent requests to one server
+
+    While latency stays within latency_tolerance times its moving average, each
+    successful response raises the limit by 1/limit, or about one more request
+    per round trip. A 429, 5xx response or timeout multiplies the limit by
+    backoff, and a Retry-After header holds back new requests until it passes.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = DEFAULT_WORKERS,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2,
+        max_retries: int = 3,
+        retry_delay: float = 1,
+        window: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.window = window
+        self.clock = clock
+        self.in_flight = 0
+        self.completed = 0
+        self.throttled = 0
+        self._latency: Optional[float] = None
+        self._last_backoff = float("-inf")
+        self._blocked_until = float("-inf")
+        self._completions: Deque[float] = collections.deque()
+        self._started = clock()
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while True:
+                wait = self._blocked_until - self.clock()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif self.in_flight >= max(int(self.limit), 1):
+                    self._condition.wait()
+                else:
+                    break
+            self.in_flight += 1
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        # Called once per acquire; latency is only given for successful responses
+        with self._condition:
+            now = self.clock()
+            self.in_flight -= 1
+            if throttled:
+                self._throttle(now, retry_after)
+            elif latency is not None:
+                self._succeed(now, latency)
+            self._condition.notify_all()
+
+    def _succeed(self, now: float, latency: float) -> None:
+        self.completed += 1
+        self._completions.append(now)
+        while self._completions[0] < now - self.window:
+            self._completions.popleft()
+        stable = self._latency is None or latency <= self.latency_tolerance * self._latency
+        self._latency = latency if self._latency is None else 0.9 * self._latency + 0.1 * latency
+        # Only grow a limit that is actually in use
+        if stable and self.in_flight + 1 >= int(self.limit):
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+
+    def _throttle(self, now: float, retry_after: Optional[float]) -> None:
+        self.throttled += 1
+        if retry_after is not None:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+        # Requests already in flight when the server pushed back don't back off again
+        if now - self._last_backoff > (self._latency or 0):
+            self.limit = max(self.limit * self.backoff, self.min_limit)
+            self._last_backoff = now
+
+    def stats(self) -> LimiterStats:
+        with self._condition:
+            now = self.clock()
+            while self._completions and self._completions[0] < now - self.window:
+                self._completions.popleft()
+            elapsed = min(self.window, now - self._started)
+            return LimiterStats(
+                limit=self.limit,
+                in_flight=self.in_flight,
+                completed=self.completed,
+                throttled=self.throttled,
+                throughput=len(self._completions) / elapsed if elapsed > 0 else 0.0,
+            )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either delay seconds or an HTTP date
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class Session(requests.Session):
+    """requests.Session with default timeouts, optional per-host concurrency limits, and optional hedged GETs
+
+    With adaptive limits enabled, each host also gets an AdaptiveLimiter that
+    backs off when the server pushes back and retries throttled GETs.
+    """
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        host_limits: Optional[Dict[str, int]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+    ) -> None:
+        super().__init__()
+        self.timeout = timeout
+        self.pool_maxsize = DEFAULT_POOLSIZE
+        self.hedge_policy = hedge_policy
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor_size = 0
+        self._hedge_executor_lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        for host, limit in (host_limits or {}).items():
+            self.set_host_limit(host, limit)
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+        self._limiter_kwargs: Optional[Dict[str, Any]] = None
+        self._limiters_lock = threading.Lock()
+
+    def set_host_limit(self, host: str, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("host limit must be at least 1")
+        self._host_semaphores[host] = threading.BoundedSemaphore(limit)
+
+    def enable_adaptive_limits(self, **limiter_kwargs: Any) -> None:
+        # Limiters are made per host on first use, with these AdaptiveLimiter arguments
+        with self._limiters_lock:
+            self._limiter_kwargs = limiter_kwargs
+            self.limiters.clear()
+
+    def disable_adaptive_limits(self) -> None:
+        with self._limiters_lock:
+            self._limiter_kwargs = None
+            self.limiters.clear()
+
+    def get_limiter(self, host: str) -> Optional[AdaptiveLimiter]:
+        with self._limiters_lock:
+            if self._limiter_kwargs is None:
+                return None
+            if host not in self.limiters:
+                self.limiters[host] = AdaptiveLimiter(**self._limiter_kwargs)
+            return self.limiters[host]
+
+    def mount_pools(self, pool_maxsize: int) -> None:
+        # Close the replaced adapters so their pooled connections don't linger
+        replaced = {self.adapters[prefix] for prefix in ("https://", "http://") if prefix in self.adapters}
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.pool_maxsize = pool_maxsize
+        for old_adapter in replaced:
+            old_adapter.close()
+
+    def request(self, method: str, url: Any, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        kwargs.setdefault("timeout", self.timeout)
+        send = functools.partial(super().request, method, url, *args, **kwargs)
+        # Host limits apply to each attempt, so a hedge waits for a free slot like any other request
+        host = urlsplit(str(url)).hostname or ""
+        limiter = self.get_limiter(host)
+        if limiter is not None:
+            send = functools.partial(_limited_send, send, limiter, retry=method.upper() == "GET")
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is not None:
+            send = functools.partial(_semaphore_send, send, semaphore)
+        # Only whole-body GETs are safe and cheap to send twice
+        if self.hedge_policy is not None and method.upper() == "GET" and not kwargs.get("stream"):
+            return self._hedged_send(send, self.hedge_policy)
+        return send()
+
+    def _hedged_send(
+        self, send: Callable[[], requests.Response], policy: HedgePolicy
+    ) -> requests.Response:
+        delay = policy.delay()
+        if delay is None:
+            # Without a possible hedge, send on this thread instead of the executor
+            return _timed(send, policy)
+        executor = self._get_hedge_executor()
+        attempts: List["Future[requests.Response]"] = [
+            executor.submit(_timed, send, policy)
+        ]
+        done, _ = wait(attempts, timeout=delay)
+        if not done and policy.try_spend():
+            attempts.append(executor.submit(_timed, send, policy))
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None or not pending:
+                    # Close whichever response loses the race once it arrives
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    if future is not attempts[0]:
+                        policy.hedges_won += 1
+                    return future.result()
+        raise AssertionError("unreachable")
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        # Two threads per pooled connection, replacing the executor when mount_pools grows the pools
+        with self._hedge_executor_lock:
+            max_workers = 2 * self.pool_maxsize
+            if self._hedge_executor is not None and self._hedge_executor_size < max_workers:
+                # Attempts already submitted still finish on the old executor
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers)
+                self._hedge_executor_size = max_workers
+            return self._hedge_executor
+
+    def close(self) -> None:
+        with self._hedge_executor_lock:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+        super().close()
+
+
+def _limited_send(
+    send: Callable[[], requests.Response], limiter: AdaptiveLimiter, retry: bool
+) -> requests.Response:
+    attempt = 0
+    while True:
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = send()
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            limiter.release(throttled=True)
+            raise
+        except BaseException:
+            limiter.release()
+            raise
+        if response.status_code not in THROTTLE_STATUSES:
+            limiter.release(latency=time.perf_counter() - start)
+            return response
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if not retry or response.status_code not in RETRY_STATUSES or attempt >= limiter.max_retries:
+            limiter.release(throttled=True, retry_after=retry_after)
+            return response
+        if retry_after is None:
+            retry_after = limiter.retry_delay * 2**attempt
+        limiter.release(throttled=True, retry_after=retry_after)
+        response.close()
+        attempt += 1
+
+
+def _semaphore_send(
+    send: Callable[[], requests.Response], semaphore: threading.BoundedSemaphore
+) -> requests.Response:
+    with semaphore:
+        return send()
+
+
+def _timed(send: Callable[[], requests.Response], policy: HedgePolicy) -> requests.Response:
+    start = time.perf_counter()
+    response = send()
+    policy.record(time.perf_counter() - start)
+    return response
+
+
+def _close_response(future: "Future[requests.Response]") -> None:
+    if future.exception() is None:
+        future.result().close()
+
+
+def make_session(
+    workers: int = DEFAULT_WORKERS,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    host_limits: Optional[Dict[str, int]] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+) -> Session:
+    # Size each host's connection pool so every worker can keep a connection open
+    session = Session(timeout=timeout, host_limits=host_limits, hedge_policy=hedge_policy)
+    session.mount_pools(max(workers, DEFAULT_POOLSIZE))
+    return session
+
+
+_shared_session: Optional[Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session(workers: int = DEFAULT_WORKERS) -> Session:
+    # One process-wide session keeps connections alive across commands, e.g. in the GUI
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = make_session(workers=workers)
+        elif _shared_session.pool_maxsize < workers:
+            _shared_session.mount_pools(workers)
+        return _shared_session
+
+
+@contextlib.contextmanager
+def shared_session(workers: int = DEFAULT_WORKERS) -> Iterator[Session]:
+    # Unlike requests.Session, leaving the block keeps the session open for the next command
+    yield get_shared_session(workers=workers)
+
+
+def close_shared_session() -> None:
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
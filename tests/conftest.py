@@ -0,0 +1,34 @@
+import pytest
+
+from cdm_util_scripts import cdm_api
+from cdm_util_scripts import sessions
+
+
+@pytest.fixture(autouse=True)
+def close_shared_session():
+    # Pooled connections would outlive the test's cassette
+    yield
+    sessions.close_shared_session()
+
+
+@pytest.fixture
+def make_field_info():
+    # Builds CdmFieldInfos that differ only in nick and vocabulary settings
+    def make_field_info(nick, vocab=0, vocdb=""):
+        return cdm_api.CdmFieldInfo(
+            name=nick.title(),
+            nick=nick,
+            type="TEXT",
+            size=0,
+            find="a0",
+            req=0,
+            search=1,
+            hide=0,
+            vocdb=vocdb,
+            vocab=vocab,
+            dc=None,
+            admin=0,
+            readonly=0,
+        )
+
+    return make_field_info
@@ -0,0 +1,83 @@
+import pytest
+
+import io
+import os
+import stat
+import json
+
+from cdm_util_scripts import catcher_json
+
+
+EDITS = [
+    {"dmrecord": "1", "subjec": "Zebras -- Africa; “Ants”", "descri": "Line one\nLine two"},
+    {"dmrecord": "2", "nested": {"list": [1, 2.5, -3e2, None, True], "empty": {}}},
+    {},
+    {"dmrecord": "3", "title": 'A "quoted" [bracketed] {braced}, title'},
+]
+
+
+@pytest.mark.parametrize("edits", [[], EDITS[:1], EDITS])
+@pytest.mark.parametrize("indent", [None, 2, 4])
+@pytest.mark.parametrize("chunk_size", [1, 7, catcher_json.READ_CHUNK_SIZE])
+def test_iter_edits(edits, indent, chunk_size):
+    text = json.dumps(edits, indent=indent)
+    assert list(catcher_json.iter_edits(io.StringIO(text), chunk_size=chunk_size)) == edits
+
+
+def test_iter_edits_numbers_across_chunks():
+    text = "[12345, 6.75e10 ,{}]"
+    assert list(catcher_json.iter_edits(io.StringIO(text), chunk_size=2)) == [12345, 6.75e10, {}]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "{}", '"edits"', "[", "[{}", "[{},]", "[{} {}]", "[{}] []", "[{]"],
+)
+def test_iter_edits_invalid(text):
+    with pytest.raises(ValueError):
+        list(catcher_json.iter_edits(io.StringIO(text), chunk_size=3))
+
+
+@pytest.mark.parametrize("edits", [[], EDITS[:1], EDITS])
+def test_write_edits(edits):
+    fp = io.StringIO()
+    count = catcher_json.write_edits(iter(edits), fp)
+    assert count == len(edits)
+    assert fp.getvalue() == json.dumps(edits, indent=2)
+
+
+def test_read_and_dump_edits(tmp_path):
+    path = tmp_path / "edits.json"
+    assert catcher_json.dump_edits(EDITS, path) == len(EDITS)
+    assert list(catcher_json.read_edits(path)) == EDITS
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_dump_edits_file_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        new_path = tmp_path / "new.json"
+        catcher_json.dump_edits(EDITS, new_path)
+        assert stat.S_IMODE(new_path.stat().st_mode) == 0o644
+
+        existing_path = tmp_path / "existing.json"
+        existing_path.write_text("[]")
+        existing_path.chmod(0o640)
+        catcher_json.dump_edits(EDITS, existing_path)
+        assert stat.S_IMODE(existing_path.stat().st_mode) == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_dump_edits_failure_leaves_path(tmp_path):
+    path = tmp_path / "edits.json"
+    path.write_text("[]")
+
+    def failing_edits():
+        yield EDITS[0]
+        raise ValueError("bad edit")
+
+    with pytest.raises(ValueError):
+        catcher_json.dump_edits(failing_edits(), path)
+    assert path.read_text() == "[]"
+    assert [child.name for child in tmp_path.iterdir()] == ["edits.json"]
@@ -1,6 +1,7 @@
 import pytest
 
 import json
+import time
 
 from cdm_util_scripts import catchercombineterms
 
@@ -58,6 +59,7 @@ def test_catchercombineterms(tmp_path, catcher_edits, results, sort_terms):
         catcher_json_file_path=catcher_json_file_path,
         output_file_path=output_file_path,
         sort_terms=sort_terms,
+        workers=1,
     )
 
     with open(output_file_path, mode="r", encoding="utf-8") as fp:
@@ -79,3 +81,80 @@ def test_catchercombineterms(tmp_path, catcher_edits, results, sort_terms):
 def test_split_terms(terms, results):
     splitted = catchercombineterms.split_terms(terms)
     assert splitted == results
+
+
+@pytest.mark.parametrize(
+    "cdm_terms,edit_terms,loose,results",
+    [
+        ([], [], False, []),
+        (["b", "a"], ["a", "c", "c"], False, ["b", "a", "c"]),
+        (["a", "a"], [], False, ["a"]),
+        (["Digital images"], ["digital  images", "Searching"], False, ["Digital images", "digital  images", "Searching"]),
+        (["Digital images"], ["digital  images", "Searching"], True, ["Digital images", "Searching"]),
+    ]
+)
+def test_combine_terms(cdm_terms, edit_terms, loose, results):
+    key = catchercombineterms.loose_term_key if loose else None
+    assert catchercombineterms.combine_terms(cdm_terms, edit_terms, key=key) == results
+
+
+def test_collect_nicks_and_dmrecords():
+    catcher_edits = iter([
+        {"dmrecord": "1", "subjec": "Term"},
+        {"dmrecord": "2", "title": "Title", "subjec": "Term"},
+    ])
+    assert catchercombineterms.collect_nicks_and_dmrecords(catcher_edits) == (["subjec", "title"], {"1", "2"})
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_catchercombineterms_concurrently(tmp_path, monkeypatch, bulk):
+    requested_dmrecords = []
+
+    def fake_request_collection_item_infos(instance_url, collection_alias, field_nicks, session, workers, dmrecords):
+        assert workers == 4
+        assert dmrecords == {"1", "2", "3", "4"}
+        return {"2": {"dmrecord": "2", "subjec": "Bulk"}}
+
+    def fake_request_item_info(instance_url, collection_alias, dmrecord, session):
+        requested_dmrecords.append(dmrecord)
+        # Later records answer first
+        time.sleep(0.01 * (5 - int(dmrecord)))
+        return {"dmrecord": dmrecord, "subjec": f"Term {dmrecord}"}
+
+    monkeypatch.setattr(catchercombineterms.cdm_api, "request_collection_item_infos", fake_request_collection_item_infos)
+    monkeypatch.setattr(catchercombineterms.cdm_api, "request_item_info", fake_request_item_info)
+    read_passes = []
+    read_edits = catchercombineterms.catcher_json.read_edits
+
+    def counting_read_edits(path):
+        read_passes.append(path)
+        return read_edits(path)
+
+    monkeypatch.setattr(catchercombineterms.catcher_json, "read_edits", counting_read_edits)
+    catcher_json_file_path = tmp_path / "catcher-edits.json"
+    output_file_path = tmp_path / "combined-edits.json"
+    with open(catcher_json_file_path, mode="w", encoding="utf-8") as fp:
+        json.dump([{"dmrecord": str(n), "subjec": "New"} for n in range(1, 5)], fp)
+
+    catchercombineterms.catchercombineterms(
+        cdm_instance_url="https://cdm.example",
+        cdm_collection_alias="coll",
+        catcher_json_file_path=catcher_json_file_path,
+        output_file_path=output_file_path,
+        sort_terms=False,
+        bulk=bulk,
+        workers=4,
+        show_progress=False,
+    )
+    # Bulk mode reads nicks and dmrecords in one extra pass
+    assert len(read_passes) == (3 if bulk else 2)
+
+    with open(output_file_path, mode="r", encoding="utf-8") as fp:
+        combined_edits = json.load(fp)
+    assert [edit["subjec"] for edit in combined_edits] == [
+        "Term 1; New",
+        "Bulk; New" if bulk else "Term 2; New",
+        "Term 3; New",
+        "Term 4; New",
+    ]
+    assert sorted(requested_dmrecords) == (["1", "3", "4"] if bulk else ["1", "2", "3", "4"])
@@ -34,6 +34,7 @@ def test_catcherdiff(tmp_path):
         catcher_json_file_path=catcher_json_file_path,
         report_file_path=report_file_path,
         check_vocabs=True,
+        workers=1,
     )
 
     delta_rows = scrape_report(report_file_path)
@@ -99,3 +100,87 @@ def test_count_changes():
     assert nicks_with_changes == collections.Counter(["format", "format"])
     assert nicks_with_edits == collections.Counter(["format", "format", "format", "date"])
 
+
+def test_request_deltas_bulk(monkeypatch):
+    requested_field_nicks = []
+    requested_dmrecords = []
+    bulk_dmrecords = []
+
+    def fake_request_collection_item_infos(instance_url, collection_alias, field_nicks, session, workers, dmrecords):
+        requested_field_nicks.extend(field_nicks)
+        bulk_dmrecords.append(dmrecords)
+        return {
+            "71": {"dmrecord": "71", "format": "pdf", "title": "Seventy-one"},
+            "72": {"dmrecord": "72", "format": "PNG", "title": "Seventy-two"},
+        }
+
+    def fake_request_item_info(instance_url, collection_alias, dmrecord, session):
+        requested_dmrecords.append(dmrecord)
+        return {"dmrecord": dmrecord, "format": "", "title": "Unpublished"}
+
+    monkeypatch.setattr(catcherdiff.cdm_api, "request_collection_item_infos", fake_request_collection_item_infos)
+    monkeypatch.setattr(catcherdiff.cdm_api, "request_item_info", fake_request_item_info)
+
+    catcher_edits = [
+        {"dmrecord": "72", "format": "PNG"},
+        {"dmrecord": "73", "format": "JPG"},
+        {"dmrecord": "71", "format": "PDF "},
+    ]
+    deltas = catcherdiff.request_deltas(
+        catcher_edits=catcher_edits,
+        instance_url="https://cdm.example",
+        collection_alias="coll",
+        session=None,
+        show_progress=False,
+        workers=1,
+        bulk=True,
+        extra_nicks=["title"],
+    )
+    assert requested_field_nicks == ["title", "format"]
+    assert bulk_dmrecords == [{"71", "72", "73"}]
+    assert requested_dmrecords == ["73"]
+    assert [delta.item_info["title"] for delta in deltas] == ["Seventy-two", "Unpublished", "Seventy-one"]
+    assert deltas[2].edit == {"dmrecord": "71", "format": "PDF"}
+
+
+def test_check_terms(make_field_info):
+    field_infos = [
+        make_field_info("title"),
+        make_field_info("subjea", vocab=1, vocdb="LCSH"),
+        make_field_info("subjeb", vocab=1, vocdb="LCSH"),
+        make_field_info("format", vocab=1),
+    ]
+    lcsh = catcherdiff.cdm_api.CdmVocabInfo(catcherdiff.cdm_api.CdmVocabType.builtin, "LCSH")
+    formats = catcherdiff.cdm_api.CdmVocabInfo(catcherdiff.cdm_api.CdmVocabType.custom, "format")
+    vocabs_by_nick = catcherdiff.index_vocabs_by_nick(
+        field_infos, {lcsh: ["Cats", "Dogs"], formats: ["PDF"]}
+    )
+    assert vocabs_by_nick == {
+        "subjea": frozenset(["Cats", "Dogs"]),
+        "subjeb": frozenset(["Cats", "Dogs"]),
+        "format": frozenset(["PDF"]),
+    }
+    assert vocabs_by_nick["subjea"] is vocabs_by_nick["subjeb"]
+    assert catcherdiff.index_vocabs_by_nick(field_infos, None) == {
+        "subjea": None,
+        "subjeb": None,
+        "format": None,
+    }
+
+    deltas = [
+        catcherdiff.Delta(
+            edit={"dmrecord": "1", "title": "Pets", "subjea": "Cats; Birds; ", "format": ""},
+            item_info={},
+        ),
+        catcherdiff.Delta(edit={"dmrecord": "2", "subjeb": "Dogs"}, item_info={}),
+    ]
+    assert catcherdiff.check_terms(deltas, vocabs_by_nick) == [
+        {
+            "subjea": [
+                catcherdiff.TermCheck(term="Cats", controlled=True),
+                catcherdiff.TermCheck(term="Birds", controlled=False),
+            ],
+            "format": [],
+        },
+        {"subjeb": [catcherdiff.TermCheck(term="Dogs", controlled=True)]},
+    ]
@@ -97,3 +97,52 @@ def test_split_controlled_vocab(before, after):
 )
 def test_sort_terms_operation(before, after):
     assert catchertidy.sort_terms_operation(before) == after
+
+
+@pytest.mark.parametrize("operations", ["", "w", "r", "l", "s", "wr", "wl", "rls", "wrls"])
+def test_compile_pipeline(operations):
+    value = "  “Zebras”  --  Africa ;Ants—Behavior;  ;  Bees  "
+    pipeline = catchertidy.compile_pipeline(
+        "subjec",
+        normalize_whitespace=["subjec"] if "w" in operations else None,
+        replace_smart_chars=["subjec"] if "r" in operations else None,
+        normalize_lcsh=["subjec"] if "l" in operations else None,
+        sort_terms=["subjec"] if "s" in operations else [],
+        lcsh_separator_spaces=False,
+    )
+    if not operations:
+        assert pipeline is None
+        return
+
+    expected = value
+    if "w" in operations:
+        expected = catchertidy.normalize_whitespace_operation(expected)
+    if "r" in operations:
+        expected = catchertidy.replace_smart_chars_operation(expected)
+    if "l" in operations:
+        expected = catchertidy.normalize_lcsh_operation(expected, separator_spaces=False)
+    if "s" in operations:
+        expected = catchertidy.sort_terms_operation(expected)
+    assert pipeline(value) == expected
+    assert catchertidy.compile_pipeline("title", normalize_whitespace=["subjec"]) is None
+
+
+def test_catchertidy_verbose_reports_lcsh_reuse(tmp_path, capsys):
+    edits = [
+        {"dmrecord": str(n), "subjec": "Zebras--Africa; Ants -- Behavior"}
+        for n in range(3)
+    ]
+    edits_path = tmp_path / "edits.json"
+    output_path = tmp_path / "output.json"
+    edits_path.write_text(json.dumps(edits))
+    catchertidy.normalize_lcsh_term.cache_clear()
+    catchertidy.catchertidy(
+        catcher_json_file_path=edits_path,
+        output_file_path=output_path,
+        normalize_lcsh=["subjec"],
+        verbose=True,
+    )
+    assert "LCSH term cache: 4 of 6 terms reused (66.7%)" in capsys.readouterr().out
+    assert {edit["subjec"] for edit in json.load(output_path.open())} == {
+        "Zebras -- Africa; Ants -- Behavior"
+    }
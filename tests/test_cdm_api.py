@@ -168,6 +168,78 @@ def test_request_collection_object_records():
             assert nick in record.fields
 
 
+@pytest.mark.parametrize("workers", [1, 3])
+def test_iter_collection_object_records(monkeypatch, workers):
+    requested_starts = []
+
+    def fake_request_dm(url, session):
+        start = int(url.split("/")[-8])
+        requested_starts.append(start)
+        return {
+            "pager": {"start": str(start), "maxrecs": "1024", "total": "2500"},
+            "records": [
+                {"collection": "/coll", "pointer": pointer, "filetype": "jp2", "parentobject": -1, "find": f"{pointer}.jp2"}
+                for pointer in range(start - 1, min(start + 1023, 2500))
+            ],
+        }
+
+    monkeypatch.setattr(cdm_api, "request_dm", fake_request_dm)
+    records = cdm_api.iter_collection_object_records(
+        instance_url="https://cdm.example",
+        collection_alias="coll",
+        field_nicks=[],
+        session=None,
+        workers=workers,
+    )
+    assert next(records).pointer == 0
+    assert [record.pointer for record in records] == list(range(1, 2500))
+    assert sorted(requested_starts) == [1, 1025, 2049]
+
+
+def test_request_collection_item_infos(monkeypatch):
+    def fake_request_collection_object_records(instance_url, collection_alias, field_nicks, session, suppress_pages, workers):
+        assert field_nicks == ["title", "subjec"]
+        assert not suppress_pages
+        return [
+            cdm_api.CdmObjectRecord(
+                collection="/coll", pointer=5, filetype="jp2", parentobject=7, find="6.jp2", title="Page", subjec={}
+            ),
+            cdm_api.CdmObjectRecord(
+                collection="/coll", pointer=7, filetype="cpd", parentobject=-1, find="8.cpd", title="Object", subjec="Term"
+            ),
+        ]
+
+    monkeypatch.setattr(cdm_api, "iter_collection_object_records", fake_request_collection_object_records)
+    item_infos = cdm_api.request_collection_item_infos(
+        instance_url="https://cdm.example",
+        collection_alias="coll",
+        field_nicks=["dmrecord", "title", "subjec"],
+        session=None,
+    )
+    assert item_infos == {
+        "5": {"dmrecord": "5", "title": "Page", "subjec": ""},
+        "7": {"dmrecord": "7", "title": "Object", "subjec": "Term"},
+    }
+
+    item_infos = cdm_api.request_collection_item_infos(
+        instance_url="https://cdm.example",
+        collection_alias="coll",
+        field_nicks=["dmrecord", "title", "subjec"],
+        session=None,
+        dmrecords={"7", "9"},
+    )
+    assert item_infos == {"7": {"dmrecord": "7", "title": "Object", "subjec": "Term"}}
+
+
+def test_collect_edit_nicks():
+    catcher_edits = [
+        {"dmrecord": "1", "subjec": "Term"},
+        {"dmrecord": "2", "title": "Title", "subjec": "Term"},
+    ]
+    assert cdm_api.collect_edit_nicks(catcher_edits) == ["subjec", "title"]
+    assert cdm_api.collect_edit_nicks(catcher_edits, extra_nicks=["identi", "title"]) == ["identi", "title", "subjec"]
+
+
 @pytest.mark.parametrize(
     "field_mapping, result",
     [
@@ -234,3 +306,106 @@ def test_read_csv_field_mapping_raises(csv_rows, tmp_path):
         writer.writerows(csv_rows)
     with pytest.raises(ValueError):
         cdm_api.read_csv_field_mapping(csv_path)
+
+
+def test_CdmInstance_memoizes(monkeypatch):
+    calls = []
+    refreshed = []
+
+    def fake_request_dm(url, session, refresh=False):
+        calls.append(url)
+        if refresh:
+            refreshed.append(url)
+        if "dmGetDublinCoreFieldInfo" in url:
+            return [{"name": "Title", "nick": "title"}]
+        if "dmGetCollectionFieldInfo" in url:
+            return [
+                {
+                    "name": "Title",
+                    "nick": "title",
+                    "type": "TEXT",
+                    "size": 0,
+                    "find": "a0",
+                    "req": 1,
+                    "search": 1,
+                    "hide": 0,
+                    "vocdb": "",
+                    "vocab": 0,
+                    "dc": "title",
+                    "admin": 0,
+                    "readonly": 0,
+                }
+            ]
+        return [{"alias": "/coll", "name": "Collection", "path": "/path", "secondary_alias": "coll"}]
+
+    monkeypatch.setattr(cdm_api, "request_dm", fake_request_dm)
+    instance = cdm_api.CdmInstance(url="https://cdm.example.org/")
+    for _ in range(2):
+        assert instance.request_collection_list(session=None)[0].alias == "/coll"
+        for alias in ["colla", "collb"]:
+            field_infos = instance.request_field_infos(collection_alias=alias, session=None)
+            assert field_infos[0].dc == "Title"
+    # One collection list, one Dublin Core mapping, and two collections' field infos
+    assert len(calls) == 4
+
+    instance.invalidate(collection_alias="colla")
+    instance.request_field_infos(collection_alias="colla", session=None)
+    instance.request_field_infos(collection_alias="collb", session=None)
+    assert len(calls) == 5
+
+    instance.invalidate()
+    instance.request_field_infos(collection_alias="collb", session=None)
+    instance.request_collection_list(session=None)
+    assert len(calls) == 8
+
+    # Refreshing asks the server again without dropping the Dublin Core mapping
+    instance.request_collection_list(session=None, refresh=True)
+    instance.request_field_infos(collection_alias="collb", session=None, refresh=True)
+    assert len(calls) == 10
+    assert [url.split("q=")[1] for url in refreshed] == ["dmGetCollectionList/json", "dmGetCollectionFieldInfo/collb/json"]
+
+
+def test_get_cdm_instance():
+    instance = cdm_api.get_cdm_instance("https://cdm.example.org/")
+    assert instance.url == "https://cdm.example.org"
+    assert cdm_api.get_cdm_instance("https://cdm.example.org") is instance
+    assert cdm_api.get_cdm_instance("https://other.example.org") is not instance
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_request_vocabs(monkeypatch, workers, make_field_info):
+    requested = []
+
+    def fake_request_field_vocab(instance_url, collection_alias, field_nick, session):
+        requested.append((collection_alias, field_nick))
+        return [f"{collection_alias} {field_nick} term"]
+
+    monkeypatch.setattr(cdm_api, "request_field_vocab", fake_request_field_vocab)
+    field_infos = [
+        make_field_info("title"),
+        make_field_info("subjea", vocab=1, vocdb="LCSH"),
+        make_field_info("subjeb", vocab=1, vocdb="LCSH"),
+        make_field_info("format", vocab=1),
+        make_field_info("type", vocab=1),
+    ]
+    instance = cdm_api.CdmInstance(url="https://cdm.example.org")
+
+    vocabs = instance.request_vocabs(
+        collection_alias="colla", field_infos=field_infos, session=None, workers=workers
+    )
+    lcsh = cdm_api.CdmVocabInfo(cdm_api.CdmVocabType.builtin, "LCSH")
+    assert list(vocabs) == [
+        lcsh,
+        cdm_api.CdmVocabInfo(cdm_api.CdmVocabType.custom, "format"),
+        cdm_api.CdmVocabInfo(cdm_api.CdmVocabType.custom, "type"),
+    ]
+    assert vocabs[lcsh] == ["colla subjea term"]
+    assert sorted(requested) == [("colla", "format"), ("colla", "subjea"), ("colla", "type")]
+
+    # Builtin vocabs are shared across the instance's collections
+    requested.clear()
+    vocabs = instance.request_vocabs(
+        collection_alias="collb", field_infos=field_infos, session=None, workers=workers
+    )
+    assert vocabs[lcsh] == ["colla subjea term"]
+    assert sorted(requested) == [("collb", "format"), ("collb", "type")]
@@ -0,0 +1,152 @@
+import pytest
+import requests
+
+from cdm_util_scripts import cdm_api
+from cdm_util_scripts import cdm_cache
+
+
+VOCAB_URL = "https://cdm.example/digital/bl/dmwebservices/index.php?q=dmGetCollectionFieldVocabulary/coll/subjec/0/1/json"
+FIELD_INFO_URL = "https://cdm.example/digital/bl/dmwebservices/index.php?q=dmGetCollectionFieldInfo/coll/json"
+ITEM_INFO_URL = "https://cdm.example/digital/bl/dmwebservices/index.php?q=dmGetItemInfo/coll/1/json"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = cdm_cache.DmCache.from_dir(tmp_path, clock=clock)
+    yield cache
+    cache.close()
+
+
+def test_DmCache_get_put(cache):
+    assert cache.get(VOCAB_URL) is None
+    cache.put(VOCAB_URL, '["a", "b"]')
+    assert cache.get(VOCAB_URL) == '["a", "b"]'
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_DmCache_persists(tmp_path, clock):
+    cache = cdm_cache.DmCache.from_dir(tmp_path, clock=clock)
+    cache.put(VOCAB_URL, '["a"]')
+    cache.close()
+    reopened = cdm_cache.DmCache.from_dir(tmp_path, clock=clock)
+    assert reopened.get(VOCAB_URL) == '["a"]'
+    reopened.close()
+
+
+def test_DmCache_ttl(cache, clock):
+    cache.put(VOCAB_URL, '["a"]')
+    clock.now += cdm_cache.DEFAULT_TTLS["dmGetCollectionFieldVocabulary"] + 1
+    assert cache.get(VOCAB_URL) is None
+    assert cache.stats().entries == 0
+
+
+def test_DmCache_uncached_function(cache):
+    cache.put(ITEM_INFO_URL, "{}")
+    assert cache.get(ITEM_INFO_URL) is None
+    assert cache.stats() == cdm_cache.CacheStats(hits=0, misses=0, entries=0, total_bytes=0)
+
+
+def test_DmCache_evicts_least_recently_used(tmp_path, clock):
+    cache = cdm_cache.DmCache.from_dir(tmp_path, clock=clock, max_bytes=10)
+    cache.put(VOCAB_URL, "12345")
+    clock.now += 1
+    cache.put(FIELD_INFO_URL, "12345")
+    clock.now += 1
+    assert cache.get(VOCAB_URL) == "12345"
+    clock.now += 1
+    cache.put(VOCAB_URL + "?", "67890")
+    assert cache.get(FIELD_INFO_URL) is None
+    assert cache.get(VOCAB_URL) == "12345"
+    assert cache.stats().total_bytes == 10
+    cache.close()
+
+
+@pytest.mark.vcr
+def test_request_dm_uses_cache(cache):
+    cdm_api.set_dm_cache(cache)
+    try:
+        with requests.Session() as session:
+            vocabs = [
+                cdm_api.request_field_vocab(
+                    instance_url="https://cdmdemo.contentdm.oclc.org",
+                    collection_alias="oclcsample",
+                    field_nick="subjec",
+                    session=session,
+                )
+                for _ in range(2)
+            ]
+    finally:
+        cdm_api.set_dm_cache(None)
+    assert vocabs[0] and vocabs[0] == vocabs[1]
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+
+def test_request_dm_refresh(cache):
+    class FakeResponse:
+        text = '[{"name": "Title", "nick": "title"}]'
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"name": "Title", "nick": "title"}]
+
+    class FakeSession:
+        def __init__(self):
+            self.urls = []
+
+        def get(self, url, **kwargs):
+            self.urls.append(url)
+            return FakeResponse()
+
+    session = FakeSession()
+    cache.put(FIELD_INFO_URL, '[{"name": "Old", "nick": "title"}]')
+    cdm_api.set_dm_cache(cache)
+    try:
+        assert cdm_api.request_dm(FIELD_INFO_URL, session=session)[0]["name"] == "Old"
+        assert session.urls == []
+        assert cdm_api.request_dm(FIELD_INFO_URL, session=session, refresh=True)[0]["name"] == "Title"
+        assert session.urls == [FIELD_INFO_URL]
+        # The refreshed body replaces the cached one
+        assert cdm_api.request_dm(FIELD_INFO_URL, session=session)[0]["name"] == "Title"
+        assert session.urls == [FIELD_INFO_URL]
+    finally:
+        cdm_api.set_dm_cache(None)
+
+
+def test_request_dm_skips_text_for_uncached_functions(cache):
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"dmrecord": "1"}
+
+        @property
+        def text(self):
+            raise AssertionError("decoded an uncached response")
+
+    class FakeSession:
+        def get(self, url, **kwargs):
+            return FakeResponse()
+
+    cdm_api.set_dm_cache(cache)
+    try:
+        assert cdm_api.request_dm(ITEM_INFO_URL, session=FakeSession()) == {"dmrecord": "1"}
+    finally:
+        cdm_api.set_dm_cache(None)
+    assert cache.stats().entries == 0
@@ -0,0 +1,49 @@
+import json
+
+from cdm_util_scripts import cli
+from cdm_util_scripts import sessions
+
+
+def test_main_without_cdm_requests_skips_cache(tmp_path):
+    cache_dir = tmp_path / "cache"
+    input_json_path = tmp_path / "edits.json"
+    input_json_path.write_text(json.dumps([{"dmrecord": "1", "title": "One"}]))
+    assert cli.main(
+        ["--cache-dir", str(cache_dir), "json2csv", str(input_json_path), str(tmp_path / "edits.csv")]
+    ) == 0
+    assert not cache_dir.exists()
+
+
+def test_open_dm_cache_warns_on_error(tmp_path, capsys):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    assert cli.open_dm_cache(str(not_a_dir / "cache")) is None
+    assert "running without the CONTENTdm response cache" in capsys.readouterr().err
+
+    cache = cli.open_dm_cache(str(tmp_path / "cache"))
+    assert cache is not None
+    cache.close()
+
+
+def test_main_adaptive_concurrency_max_limit(tmp_path, monkeypatch):
+    limiters = []
+
+    def fake_catcherdiff(**kwargs):
+        limiters.append(sessions.get_shared_session().get_limiter("example.org"))
+
+    monkeypatch.setattr(cli.catcherdiff, "catcherdiff", fake_catcherdiff)
+    for workers in ["2", "32"]:
+        assert cli.main(
+            [
+                "--no-cache",
+                "--adaptive-concurrency",
+                "catcherdiff",
+                "--workers",
+                workers,
+                "https://cdm.example",
+                "coll",
+                str(tmp_path / "edits.json"),
+                str(tmp_path / "report.html"),
+            ]
+        ) == 0
+    assert [(limiter.limit, limiter.max_limit) for limiter in limiters] == [(2, 2), (cli.DEFAULT_WORKERS, 32)]
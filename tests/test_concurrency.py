@@ -0,0 +1,46 @@
+import pytest
+
+import time
+import threading
+
+from cdm_util_scripts import concurrency
+
+
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_ordered_map(workers):
+    def slow_double(n):
+        time.sleep(0.01 * (n % 3))
+        return n * 2
+
+    assert list(concurrency.ordered_map(slow_double, range(20), workers=workers)) == [
+        n * 2 for n in range(20)
+    ]
+
+
+def test_ordered_map_bounds_workers():
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def track(n):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return n
+
+    assert list(concurrency.ordered_map(track, range(12), workers=3)) == list(range(12))
+    assert max_active <= 3
+
+
+def test_ordered_map_raises():
+    def fail_on_three(n):
+        if n == 3:
+            raise ValueError(n)
+        return n
+
+    with pytest.raises(ValueError):
+        list(concurrency.ordered_map(fail_on_three, range(6), workers=2))
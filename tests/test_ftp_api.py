@@ -1,6 +1,8 @@
 import pytest
 import requests
 
+import time
+
 from cdm_util_scripts import ftp_api
 
 
@@ -58,7 +60,7 @@ def test_FtpProject_requests_works():
         project = projects.request_project(
             label="Dance Posters Metadata", session=session
         )
-        project.request_works(session=session)
+        project.request_works(session=session, workers=1)
     for work in project.works:
         assert work.metadata
         assert work.renderings
@@ -68,6 +70,18 @@ def test_FtpProject_requests_works():
         assert work.cdm_object_dmrecord
 
 
+def test_FtpProject_request_works_concurrently(monkeypatch):
+    def fake_request(self, session):
+        time.sleep(0.01 * (int(self.url) % 3))
+        self.label = f"Work {self.url}"
+
+    monkeypatch.setattr(ftp_api.FtpWork, "request", fake_request)
+    project = ftp_api.FtpProject(url="https://fromthepage.com/iiif/collection/1", label="Project")
+    project.works = [ftp_api.FtpWork(url=str(n)) for n in range(10)]
+    project.request_works(session=None, show_progress=False, workers=3)
+    assert [work.label for work in project.works] == [f"Work {n}" for n in range(10)]
+
+
 @pytest.mark.vcr
 def test_FtpProject_request_structured_data_configs():
     project = ftp_api.FtpProject(
@@ -201,3 +215,56 @@ def test_parse_cdm_iiif_manifest_url(url, instance_url, alias, dmrecord):
 )
 def test_parse_ftp_canvas_id(url, instance_url, alias, dmrecord):
     assert ftp_api.parse_ftp_canvas_id(url) == (instance_url, alias, dmrecord)
+
+
+XHTML_EXPORT = """  <?xml version="1.0" encoding="UTF-8"?>
+  <html xmlns="http://www.w3.org/1999/xhtml">
+    <head>
+<script type="text/javascript">if (a < b && c) { d(); }</script>
+    </head>
+    <body>
+      <div class="pages">
+        <div id="page-1">
+          <div class="page-content">
+            <p><span>Title: </span>First</p>
+            <p>More</p>
+          </div>
+        </div>
+        <div id="page-2">
+          <div class="page-content"></div>
+        </div>
+        <div id="page-3">
+          <div class="page-content">
+            <p><span>Title: </span>Third</p>
+          </div>
+        </div>
+      </div>
+    </body>
+  </html>
+""".encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, len(XHTML_EXPORT)])
+def test_iter_fields_from_xhtml(chunk_size):
+    chunks = [XHTML_EXPORT[i:i + chunk_size] for i in range(0, len(XHTML_EXPORT), chunk_size)]
+    pages = ftp_api.iter_fields_from_xhtml(chunks)
+    assert next(pages) == {"Title": "First\n\nMore"}
+    assert list(pages) == [None, {"Title": "Third"}]
+
+
+def test_iter_page_texts_from_xhtml():
+    assert list(ftp_api.iter_page_texts_from_xhtml([XHTML_EXPORT])) == [
+        "Title: First\n\nMore",
+        "",
+        "Title: Third",
+    ]
+
+
+def test_iter_structured_data(monkeypatch):
+    def fake_request_structured_data(self, session):
+        time.sleep(0.01 * (len(self.id_) % 3))
+        return self.id_
+
+    monkeypatch.setattr(ftp_api.FtpPage, "request_structured_data", fake_request_structured_data)
+    pages = [ftp_api.FtpPage(id_="p" * n) for n in range(1, 10)]
+    assert list(ftp_api.iter_structured_data(pages, session=None, workers=3)) == [page.id_ for page in pages]
@@ -88,6 +88,7 @@ def test_ftpstruct2catcher_farfel(tmp_path, farfel_field_mapping, level):
         field_mapping_csv_path=farfel_field_mapping,
         level=level,
         output_file_path=output_file_path,
+        workers=1,
     )
 
     with open(output_file_path, mode="r", encoding="utf-8") as fp:
@@ -117,6 +118,7 @@ def test_ftpstruct2catcher_dance(tmp_path, dance_posters_field_mapping, level):
         field_mapping_csv_path=dance_posters_field_mapping,
         level=ftpstruct2catcher.Level.PAGE,
         output_file_path=output_file_path,
+        workers=1,
     )
 
     with open(output_file_path, mode="r", encoding="utf-8") as fp:
@@ -39,3 +39,125 @@ def test_ftptransc2catcher(tmp_path):
         assert edit[transcript_nick].startswith(start)
         assert edit[transcript_nick] == edit[transcript_nick].strip()
         assert set(edit) == {"dmrecord", transcript_nick}
+
+
+def test_ftptransc2catcher_bulk(tmp_path, monkeypatch):
+    def fake_from_url(url, session):
+        return ftp_api.FtpWork(
+            url=url,
+            pages=[
+                ftp_api.FtpPage(id_=f"{url}/canvas/{n}", cdm_page_dmrecord=str(n), page_status=["hasTranscript"])
+                for n in range(3)
+            ],
+        )
+
+    def fake_iter_page_transcripts(self, session):
+        if self.url.endswith("short"):
+            return iter(["one page"])
+        return iter([f"{self.url} page {n}\n" for n in range(3)])
+
+    monkeypatch.setattr(ftp_api.FtpWork, "from_url", fake_from_url)
+    monkeypatch.setattr(ftp_api.FtpWork, "iter_page_transcripts", fake_iter_page_transcripts)
+    manifests_listing_path = tmp_path / "manifests.txt"
+    manifests_listing_path.write_text("work1\nwork2\n", encoding="utf-8")
+    output_path = tmp_path / "output.json"
+
+    ftptransc2catcher.ftptransc2catcher(
+        manifests_listing_path=manifests_listing_path,
+        transcript_nick="transc",
+        output_file_path=output_path,
+        transcript_type="Verbatim Plaintext",
+        bulk=True,
+        show_progress=False,
+    )
+
+    with open(output_path, mode="r", encoding="utf-8") as fp:
+        output_json = json.load(fp)
+    assert output_json == [
+        {"dmrecord": str(n), "transc": f"{work} page {n}"}
+        for work in ["work1", "work2"]
+        for n in range(3)
+    ]
+
+    manifests_listing_path.write_text("short\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ftptransc2catcher.ftptransc2catcher(
+            manifests_listing_path=manifests_listing_path,
+            transcript_nick="transc",
+            output_file_path=output_path,
+            transcript_type="Verbatim Plaintext",
+            bulk=True,
+            show_progress=False,
+        )
+    with pytest.raises(ValueError):
+        ftptransc2catcher.ftptransc2catcher(
+            manifests_listing_path=manifests_listing_path,
+            transcript_nick="transc",
+            output_file_path=output_path,
+            transcript_type="Emended Plaintext",
+            bulk=True,
+        )
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+@pytest.mark.parametrize("omit_skipped", [False, True])
+def test_ftptransc2catcher_skips_pages_without_transcripts(tmp_path, monkeypatch, capsys, bulk, omit_skipped):
+    page_statuses = {
+        "work1": [["hasTranscript"], ["markedBlank"], [], ["hasTranscript", "markedBlank"]],
+        "work2": [[], ["unedited"]],
+    }
+    requested = []
+
+    def fake_from_url(url, session):
+        return ftp_api.FtpWork(
+            url=url,
+            pages=[
+                ftp_api.FtpPage(id_=f"{url}/canvas/{n}", cdm_page_dmrecord=f"{url}-{n}", page_status=page_status)
+                for n, page_status in enumerate(page_statuses[url])
+            ],
+        )
+
+    def fake_request_transcript(self, label, session):
+        requested.append(self.id_)
+        return f"{self.id_} text"
+
+    def fake_iter_page_transcripts(self, session):
+        requested.append(self.url)
+        return iter([f"{page.id_} text" for page in self.pages])
+
+    monkeypatch.setattr(ftp_api.FtpWork, "from_url", fake_from_url)
+    monkeypatch.setattr(ftp_api.FtpPage, "request_transcript", fake_request_transcript)
+    monkeypatch.setattr(ftp_api.FtpWork, "iter_page_transcripts", fake_iter_page_transcripts)
+    manifests_listing_path = tmp_path / "manifests.txt"
+    manifests_listing_path.write_text("work1\nwork2\n", encoding="utf-8")
+    output_path = tmp_path / "output.json"
+
+    ftptransc2catcher.ftptransc2catcher(
+        manifests_listing_path=manifests_listing_path,
+        transcript_nick="transc",
+        output_file_path=output_path,
+        transcript_type="Verbatim Plaintext",
+        bulk=bulk,
+        omit_skipped=omit_skipped,
+        show_progress=False,
+    )
+
+    with open(output_path, mode="r", encoding="utf-8") as fp:
+        output_json = json.load(fp)
+    if omit_skipped:
+        assert output_json == [{"dmrecord": "work1-0", "transc": "work1/canvas/0 text"}]
+    else:
+        assert output_json == [
+            {"dmrecord": "work1-0", "transc": "work1/canvas/0 text"},
+            {"dmrecord": "work1-1", "transc": ""},
+            {"dmrecord": "work1-2", "transc": ""},
+            {"dmrecord": "work1-3", "transc": ""},
+            {"dmrecord": "work2-0", "transc": ""},
+            {"dmrecord": "work2-1", "transc": ""},
+        ]
+    if bulk:
+        assert requested == ["work1"]
+        assert "Skipped 1 transcript requests" in capsys.readouterr().out
+    else:
+        assert requested == ["work1/canvas/0"]
+        assert "Skipped 5 transcript requests" in capsys.readouterr().out
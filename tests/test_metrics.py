@@ -0,0 +1,80 @@
+import pytest
+import requests
+
+import json
+from pathlib import Path
+
+from cdm_util_scripts import cdm_api
+from cdm_util_scripts import cdm_cache
+from cdm_util_scripts import metrics
+
+
+def test_RequestMetrics(tmp_path):
+    request_metrics = metrics.RequestMetrics()
+    request_metrics.record_request("ftp/manifest", 0.01, nbytes=100)
+    request_metrics.record_request("ftp/manifest", 0.3, nbytes=50, error=True)
+    request_metrics.record_request("ftp/manifest", 100)
+    request_metrics.record_decode("ftp/manifest", 0.002)
+    request_metrics.record_bytes("ftp/manifest", 25)
+    request_metrics.record_cache_hit("cdm/dmGetCollectionList")
+    request_metrics.record_stage("report/report.html.j2", 0.5)
+
+    stats = request_metrics.endpoints["ftp/manifest"]
+    assert (stats.requests, stats.errors, stats.bytes) == (3, 1, 175)
+    assert stats.max_seconds == 100
+    assert stats.histogram == [1, 0, 0, 1, 0, 0, 0, 0, 0, 1]
+    assert request_metrics.endpoints["cdm/dmGetCollectionList"].cache_hits == 1
+
+    summary = request_metrics.format_summary().splitlines()
+    assert summary[0].startswith("cdm/dmGetCollectionList: 0 requests (0 failed, 1 cached)")
+    assert summary[1].startswith("ftp/manifest: 3 requests (1 failed, 0 cached)")
+    assert summary[2] == "report/report.html.j2: 0.500s"
+
+    json_path = tmp_path / "metrics.json"
+    request_metrics.write_json(json_path)
+    with open(json_path, encoding="utf-8") as fp:
+        assert json.load(fp) == request_metrics.as_dict()
+
+
+# Replays the requests recorded for test_cdm_cache
+DM_CACHE_CASSETTE = Path(__file__).parent / "cassettes" / "test_cdm_cache" / "test_request_dm_uses_cache.yaml"
+
+
+@pytest.mark.vcr
+@pytest.mark.default_cassette(str(DM_CACHE_CASSETTE))
+def test_request_dm_records_metrics(tmp_path):
+    request_metrics = metrics.RequestMetrics()
+    cache = cdm_cache.DmCache.from_dir(tmp_path)
+    metrics.set_metrics(request_metrics)
+    cdm_api.set_dm_cache(cache)
+    try:
+        with requests.Session() as session:
+            for _ in range(2):
+                cdm_api.request_field_vocab(
+                    instance_url="https://cdmdemo.contentdm.oclc.org",
+                    collection_alias="oclcsample",
+                    field_nick="subjec",
+                    session=session,
+                )
+    finally:
+        cdm_api.set_dm_cache(None)
+        metrics.set_metrics(None)
+        cache.close()
+    stats = request_metrics.endpoints["cdm/dmGetCollectionFieldVocabulary"]
+    assert (stats.requests, stats.errors, stats.cache_hits) == (1, 0, 1)
+    assert stats.bytes > 0
+    assert sum(stats.histogram) == 1
+    assert stats.decode_seconds > 0
+
+
+def test_timed_get_without_metrics():
+    class FakeSession:
+        def get(self, url, **kwargs):
+            return (url, kwargs)
+
+    assert metrics.get_metrics() is None
+    assert metrics.timed_get(FakeSession(), "https://example.org", "test", stream=True) == (
+        "https://example.org",
+        {"stream": True},
+    )
+    assert list(metrics.count_bytes("test", [b"a", b"bc"])) == [b"a", b"bc"]
@@ -0,0 +1,18 @@
+import jinja2
+
+from cdm_util_scripts import reports
+
+
+def test_write_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, "STREAM_BUFFER_SIZE", 2)
+    report_path = tmp_path / "report.html"
+    reports.write_report("base.html.j2", report_path)
+
+    env = jinja2.Environment(
+        loader=jinja2.PackageLoader("cdm_util_scripts"),
+        autoescape=True,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    with open(report_path, mode="r", encoding="utf-8") as fp:
+        assert fp.read() == env.get_template("base.html.j2").render()
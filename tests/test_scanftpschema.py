@@ -79,6 +79,7 @@ def test_scanftpschema(tmp_path):
         ftp_slug="ohiouniversitylibraries",
         ftp_project_name="Farfel Leaves Metadata",
         report_path=report_path,
+        workers=1,
     )
 
     report = ET.parse(report_path)
@@ -0,0 +1,275 @@
+import pytest
+
+import threading
+import time
+
+from cdm_util_scripts import sessions
+
+
+def test_make_session():
+    session = sessions.make_session(workers=32)
+    assert session.pool_maxsize == 32
+    assert session.get_adapter("https://example.org")._pool_maxsize == 32
+    assert sessions.make_session(workers=1).pool_maxsize == sessions.DEFAULT_POOLSIZE
+
+
+def test_Session_mount_pools_closes_replaced_adapters(monkeypatch):
+    closed = []
+    monkeypatch.setattr(sessions.HTTPAdapter, "close", lambda self: closed.append(self))
+    session = sessions.make_session(workers=16)
+    # requests.Session mounts one default adapter per scheme
+    assert len(closed) == 2
+    closed.clear()
+    old_adapter = session.get_adapter("https://example.org")
+    session.mount_pools(32)
+    assert closed == [old_adapter]
+    assert session.get_adapter("https://example.org") is not old_adapter
+
+
+def test_get_shared_session():
+    session = sessions.get_shared_session(workers=2)
+    with sessions.shared_session(workers=16) as shared:
+        assert shared is session
+    assert session.pool_maxsize == 16
+    sessions.close_shared_session()
+    assert sessions.get_shared_session() is not session
+
+
+def test_Session_timeout_and_host_limits(monkeypatch):
+    active = {"example.org": 0}
+    max_active = {"example.org": 0}
+    timeouts = []
+    lock = threading.Lock()
+
+    def fake_request(self, method, url, *args, **kwargs):
+        timeouts.append(kwargs.get("timeout"))
+        with lock:
+            active["example.org"] += 1
+            max_active["example.org"] = max(max_active["example.org"], active["example.org"])
+        time.sleep(0.01)
+        with lock:
+            active["example.org"] -= 1
+
+    monkeypatch.setattr(sessions.requests.Session, "request", fake_request)
+    session = sessions.Session(timeout=(1, 2), host_limits={"example.org": 2})
+    threads = [
+        threading.Thread(target=session.get, args=(f"https://example.org/{n}",))
+        for n in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    session.get("https://example.org/", timeout=5)
+    assert max_active["example.org"] == 2
+    assert timeouts == [(1, 2)] * 8 + [5]
+
+    with pytest.raises(ValueError):
+        session.set_host_limit("example.org", 0)
+
+
+def test_HedgePolicy():
+    policy = sessions.HedgePolicy(percentile=50, budget=0.5, min_samples=4)
+    assert policy.delay() is None
+    for latency in [0.4, 0.1, 0.3, 0.2]:
+        policy.record(latency)
+    assert policy.delay() == 0.3
+    assert policy.try_spend()
+    assert not policy.try_spend()
+    assert policy.hedges_sent == 1
+    # With the budget spent there is nothing to wait for
+    assert policy.delay() is None
+
+    with pytest.raises(ValueError):
+        sessions.HedgePolicy(percentile=100)
+
+
+def test_Session_hedges_slow_gets(monkeypatch):
+    calls = []
+    closed = []
+    lock = threading.Lock()
+
+    class FakeResponse:
+        def __init__(self, attempt):
+            self.attempt = attempt
+
+        def close(self):
+            closed.append(self.attempt)
+
+    def fake_request(self, method, url, *args, **kwargs):
+        with lock:
+            attempt = len(calls)
+            calls.append((method, url))
+        # The first slow request is answered after its hedge
+        if url.endswith("slow") and attempt == 0:
+            time.sleep(0.2)
+        return FakeResponse(attempt)
+
+    monkeypatch.setattr(sessions.requests.Session, "request", fake_request)
+    policy = sessions.HedgePolicy(percentile=50, budget=1, min_samples=1)
+    policy.record(0.01)
+    session = sessions.Session(hedge_policy=policy)
+
+    response = session.get("https://example.org/slow")
+    assert response.attempt == 1
+    assert calls == [("GET", "https://example.org/slow")] * 2
+    assert (policy.hedges_sent, policy.hedges_won) == (1, 1)
+    time.sleep(0.3)
+    assert closed == [0]
+
+    # Streamed and non-GET requests are never duplicated
+    calls.clear()
+    session.get("https://example.org/slow", stream=True)
+    calls.clear()
+    session.post("https://example.org/slow")
+    assert len(calls) == 1
+    session.close()
+
+
+def test_Session_hedges_within_host_limits(monkeypatch):
+    calls = []
+    active = [0]
+    max_active = [0]
+    lock = threading.Lock()
+
+    def fake_request(self, method, url, *args, **kwargs):
+        with lock:
+            calls.append(url)
+            active[0] += 1
+            max_active[0] = max(max_active[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    monkeypatch.setattr(sessions.requests.Session, "request", fake_request)
+    policy = sessions.HedgePolicy(percentile=50, budget=1, min_samples=1)
+    policy.record(0.01)
+    session = sessions.Session(host_limits={"example.org": 1}, hedge_policy=policy)
+    session.get("https://example.org/slow")
+    time.sleep(0.1)
+    assert policy.hedges_sent == 1
+    assert len(calls) == 2
+    assert max_active[0] == 1
+    session.close()
+
+
+def test_Session_hedge_executor_grows():
+    session = sessions.Session()
+    executor = session._get_hedge_executor()
+    assert session._get_hedge_executor() is executor
+    session.mount_pools(4 * session.pool_maxsize)
+    grown = session._get_hedge_executor()
+    assert grown is not executor
+    assert grown._max_workers == 2 * session.pool_maxsize
+    session.close()
+
+
+def test_Session_hedge_budget(monkeypatch):
+    calls = []
+    threads = []
+    lock = threading.Lock()
+
+    def fake_request(self, method, url, *args, **kwargs):
+        with lock:
+            calls.append(url)
+            threads.append(threading.current_thread())
+        time.sleep(0.02)
+
+    monkeypatch.setattr(sessions.requests.Session, "request", fake_request)
+    policy = sessions.HedgePolicy(percentile=1, budget=0.25, min_samples=1)
+    policy.record(0.001)
+    session = sessions.Session(hedge_policy=policy)
+    for n in range(8):
+        session.get(f"https://example.org/{n}")
+    assert policy.hedges_sent == 2
+    assert len(calls) == 10
+    # Only requests that could afford a hedge go through the executor
+    assert threads.count(threading.current_thread()) == 6
+    session.close()
+
+
+def test_AdaptiveLimiter():
+    now = [0.0]
+    limiter = sessions.AdaptiveLimiter(initial_limit=2, max_limit=3, clock=lambda: now[0])
+    for _ in range(4):
+        limiter.acquire()
+        limiter.acquire()
+        now[0] += 1
+        limiter.release(latency=0.1)
+        limiter.release(latency=0.1)
+    assert limiter.limit == 3
+    # Latency spikes stop the limit from growing
+    limiter.limit = 2.0
+    limiter.acquire()
+    limiter.acquire()
+    limiter.release(latency=10)
+    limiter.release(latency=0.1)
+    assert limiter.limit < 2.5
+
+    limiter.limit = 3.0
+    for _ in range(2):
+        limiter.acquire()
+    limiter.release(throttled=True)
+    limiter.release(throttled=True)
+    assert limiter.limit == 1.5
+    now[0] += 10
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 1
+
+    stats = limiter.stats()
+    assert (stats.completed, stats.throttled, stats.in_flight) == (10, 3, 0)
+    assert stats.throughput == 10 / 14
+
+    with pytest.raises(ValueError):
+        sessions.AdaptiveLimiter(initial_limit=100, max_limit=10)
+
+
+def test_AdaptiveLimiter_retry_after():
+    limiter = sessions.AdaptiveLimiter()
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0.1)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+    limiter.release()
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [(None, None), ("", None), ("120", 120), ("soon", None), ("Wed, 21 Oct 2015 07:28:00 GMT", 0)],
+)
+def test_parse_retry_after(value, expected):
+    assert sessions.parse_retry_after(value) == expected
+
+
+def test_Session_adaptive_limits(monkeypatch):
+    statuses = [429, 503, 200, 500]
+    calls = []
+
+    class FakeResponse:
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.headers = {"Retry-After": "0"}
+
+        def close(self):
+            pass
+
+    def fake_request(self, method, url, *args, **kwargs):
+        calls.append((method, url))
+        return FakeResponse(statuses.pop(0))
+
+    monkeypatch.setattr(sessions.requests.Session, "request", fake_request)
+    session = sessions.Session()
+    assert session.get_limiter("example.org") is None
+    session.enable_adaptive_limits(initial_limit=8)
+    assert session.get("https://example.org/").status_code == 200
+    assert len(calls) == 3
+    # POSTs and errors that aren't throttling aren't retried
+    assert session.post("https://example.org/").status_code == 500
+    assert len(calls) == 4
+    limiter = session.limiters["example.org"]
+    assert limiter.stats().throttled == 3
+    assert limiter.limit < 8
+    session.disable_adaptive_limits()
+    assert session.limiters == {}